@@ -5,25 +5,46 @@ FastAPI application for the multi-agent career simulation system
 
 import os
 import time
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from contextlib import asynccontextmanager
-from typing import Optional
+from typing import Optional, BinaryIO
 import uuid
-from fastapi import FastAPI, HTTPException, Header, File, UploadFile, Request, Cookie
+import secrets
+import hashlib
+import orjson
+from fastapi import FastAPI, HTTPException, Header, File, UploadFile, Request, Cookie, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse, Response, StreamingResponse
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from dotenv import load_dotenv
 import io
 from livekit import api as livekit_api
 from src.models.career_profile import CareerProfile
-from src.models.state import CareerSimulationState, CareerMatcherResult, CareerFit
+from src.models.state import (
+    CareerSimulationState,
+    CareerMatcherResult,
+    CareerFit,
+    DashboardData,
+    TimelineSimulation,
+    FinancialAnalysis,
+    RiskAssessment,
+    GapAnalysis,
+)
 from src.graph import (
     run_career_simulation, 
     run_career_simulation_async, 
     run_career_matching_async,
     run_career_simulation_for_selected_async,
+    stream_career_simulation_for_selected,
+    prefetch_market_insights,
     career_simulator,
 )
+from src.agents.career_matcher import warm_career_matcher
+from src.agents.financial_advisor import warm_financial_advisor
+from src.agents.gap_analyst import warm_gap_analyst
 from src.database import (
     connect_to_mongodb,
     close_mongodb_connection,
@@ -37,25 +58,80 @@ from src.database import (
     delete_career_roadmap,
 )
 from src.auth import get_current_user_id, get_token_from_request, get_user_id_from_token
+from src.session_store import (
+    connect_to_redis,
+    close_redis_connection,
+    save_session,
+    get_session,
+    update_session,
+    delete_session,
+    run_session_sweeper,
+    get_cached_analysis,
+    cache_analysis,
+    ANALYZE_CACHE_ENABLED,
+)
 
 # Load environment variables
 load_dotenv('.env.local')
-# In-memory session storage for two-stage process
-# In production, use Redis or database
-_session_store: dict[str, dict] = {}
+
+# Process pool for CPU-bound PDF page extraction (created in lifespan)
+_pdf_process_pool: Optional[ProcessPoolExecutor] = None
+PDF_PARSE_WORKERS = int(os.getenv("PDF_PARSE_WORKERS", min(4, os.cpu_count() or 1)))
+# Dedicated threads for blocking resume I/O and parsing, kept apart from the
+# shared default threadpool used by sync endpoints and stdlib async shims
+_parse_thread_pool: Optional[ThreadPoolExecutor] = None
 
 
 # Lifespan context manager for startup/shutdown events
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler"""
+    global _pdf_process_pool, _parse_thread_pool
     print("🚀 Career Path Simulator starting up...")
     # Connect to MongoDB
     await connect_to_mongodb()
+    # Connect to Redis session store
+    await connect_to_redis()
+    session_sweeper = asyncio.create_task(run_session_sweeper())
+    # Start process pool for resume parsing
+    _pdf_process_pool = ProcessPoolExecutor(max_workers=PDF_PARSE_WORKERS)
+    _parse_thread_pool = ThreadPoolExecutor(
+        max_workers=int(os.getenv("PARSE_THREAD_WORKERS", 32)),
+        thread_name_prefix="parse",
+    )
+    # Resolve response model schemas now rather than on the first request
+    for model in (
+        SimulationResponse,
+        CareerMatchingResponse,
+        CareerFitResponse,
+        CareerFitReasoningResponse,
+        ResumeParseResponse,
+        HealthResponse,
+    ):
+        model.model_rebuild()
+    # Build the CareerMatcher structured-output chain (schema + client) up front
+    try:
+        warm_career_matcher()
+    except Exception as e:
+        print(f"⚠️ Could not pre-build CareerMatcher chain: {e}")
+    try:
+        warm_financial_advisor()
+    except Exception as e:
+        print(f"⚠️ Could not pre-build FinancialAdvisor chain: {e}")
+    try:
+        warm_gap_analyst()
+    except Exception as e:
+        print(f"⚠️ Could not pre-build GapAnalyst chain: {e}")
     print("📊 Multi-agent system initialized")
     yield
-    # Close MongoDB connection
+    # Close MongoDB and Redis connections
     await close_mongodb_connection()
+    await close_redis_connection()
+    _pdf_process_pool.shutdown(cancel_futures=True)
+    _pdf_process_pool = None
+    _parse_thread_pool.shutdown(cancel_futures=True)
+    _parse_thread_pool = None
+    session_sweeper.cancel()
     print("👋 Career Path Simulator shutting down...")
 
 
@@ -76,17 +152,23 @@ app = FastAPI(
     """,
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS middleware for frontend
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Configure appropriately for production
+    # Credentialed requests cannot use "*", so origins must be listed explicitly
+    allow_origins=[o.strip() for o in os.getenv("CORS_ORIGINS", "http://localhost:5173,http://localhost:3000").split(",") if o.strip()],
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT", "DELETE"],
+    allow_headers=["Content-Type", "Authorization", "X-Sandbox-Id"],
+    max_age=86400,  # Let browsers cache preflight responses for a day
 )
 
+# Compress large JSON payloads (dashboard + timeline can be tens of KB)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 
 # Request/Response models
 class SimulationRequest(BaseModel):
@@ -137,11 +219,11 @@ class SimulationResponse(BaseModel):
     simulation_id: str
     processing_time_ms: float
     summary: dict
-    dashboard_data: Optional[dict] = None
-    timeline: Optional[dict] = None
-    financial_analysis: Optional[dict] = None
-    risk_assessment: Optional[dict] = None
-    gap_analysis: Optional[dict] = None
+    dashboard_data: Optional[DashboardData] = None
+    timeline: Optional[TimelineSimulation] = None
+    financial_analysis: Optional[FinancialAnalysis] = None
+    risk_assessment: Optional[RiskAssessment] = None
+    gap_analysis: Optional[GapAnalysis] = None
     warnings: list[str] = []
     errors: list[str] = []
 
@@ -164,6 +246,9 @@ class CareerFitReasoningResponse(BaseModel):
     market_demand_reasons: list[str] = []
     potential_challenges: list[str] = []
     why_now: str = ""
+    
+    class Config:
+        from_attributes = True
 
 
 class CareerFitResponse(BaseModel):
@@ -184,6 +269,9 @@ class CareerFitResponse(BaseModel):
     top_3_reasons: list[str]
     key_skills_needed: list[str]
     immediate_next_steps: list[str]
+    
+    class Config:
+        from_attributes = True
 
 
 class CareerMatchingResponse(BaseModel):
@@ -207,6 +295,12 @@ class SelectCareerRequest(BaseModel):
     user_id: Optional[str] = None  # Optional user ID to save roadmap
 
 
+class BatchSelectCareerRequest(BaseModel):
+    """Request to run Stage 2 for several career fits side by side"""
+    session_id: str
+    career_indices: list[int] = [0, 1, 2]
+
+
 # ============ Save Profile Models ============
 
 class SaveProfileRequest(BaseModel):
@@ -495,6 +589,112 @@ class ResumeParseResponse(BaseModel):
     error: Optional[str] = None
 
 
+MAX_RESUME_SIZE = 5 * 1024 * 1024  # 5MB
+_MULTIPART_OVERHEAD = 64 * 1024  # Boundaries and part headers around the file
+PARALLEL_PDF_MIN_PAGES = 4  # Below this, process-pool overhead outweighs the speedup
+
+
+@app.middleware("http")
+async def reject_oversized_resume(request: Request, call_next):
+    """
+    Reject oversized resume uploads from the Content-Length header.
+    
+    FastAPI spools the whole multipart body before parse_resume runs, so
+    the size check there alone would still buffer a huge upload first.
+    """
+    if request.url.path == "/parse-resume":
+        content_length = request.headers.get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > MAX_RESUME_SIZE + _MULTIPART_OVERHEAD:
+            return JSONResponse(status_code=413, content={"detail": "File size must be less than 5MB."})
+    return await call_next(request)
+
+
+def _open_pdf_reader(source: bytes | BinaryIO):
+    """Open a PDF reader over raw bytes or a file object, preferring pypdf over PyPDF2."""
+    stream = io.BytesIO(source) if isinstance(source, bytes) else source
+    try:
+        import pypdf
+        return pypdf.PdfReader(stream)
+    except ImportError:
+        # Fallback: Try PyPDF2
+        try:
+            import PyPDF2
+            return PyPDF2.PdfReader(stream)
+        except ImportError:
+            raise HTTPException(
+                status_code=500,
+                detail="PDF parsing library not available. Please install pypdf or PyPDF2."
+            )
+
+
+def _extract_pdf_text(pdf_reader) -> str:
+    """Extract text from every page of an open PDF reader (blocking)."""
+    return "".join(page.extract_text() or "" for page in pdf_reader.pages)
+
+
+def _extract_pdf_pages(content: bytes, start: int, stop: int) -> str:
+    """Extract text from a contiguous range of PDF pages (runs in the process pool)."""
+    pages = _open_pdf_reader(content).pages
+    return "".join(pages[i].extract_text() or "" for i in range(start, stop))
+
+
+def _read_upload(stream: BinaryIO) -> bytes:
+    """Read a spooled upload from the start (blocking)."""
+    stream.seek(0)
+    return stream.read()
+
+
+async def _run_in_parse_pool(func, *args):
+    """Run a blocking parse step on the dedicated parse threads."""
+    if _parse_thread_pool is None:
+        return await run_in_threadpool(func, *args)
+    return await asyncio.get_running_loop().run_in_executor(_parse_thread_pool, func, *args)
+
+
+async def _parse_pdf(stream: BinaryIO) -> str:
+    """
+    Extract text from an uploaded PDF without blocking the event loop.
+    
+    Short resumes are parsed in a worker thread straight from the spooled
+    upload; longer documents are split into one contiguous page range per
+    pool worker, since page extraction is CPU-bound and holds the GIL.
+    """
+    pdf_reader = await _run_in_parse_pool(_open_pdf_reader, stream)
+    page_count = len(pdf_reader.pages)
+    if _pdf_process_pool is None or page_count < PARALLEL_PDF_MIN_PAGES:
+        return await _run_in_parse_pool(_extract_pdf_text, pdf_reader)
+    
+    # Worker processes need the raw bytes, so only this path materializes them
+    content = await _run_in_parse_pool(_read_upload, stream)
+    # One task per worker, so each process pickles and parses the PDF only once
+    chunk_size = -(-page_count // min(PDF_PARSE_WORKERS, page_count))
+    loop = asyncio.get_running_loop()
+    parts = await asyncio.gather(*[
+        loop.run_in_executor(
+            _pdf_process_pool, _extract_pdf_pages, content, start, min(start + chunk_size, page_count)
+        )
+        for start in range(0, page_count, chunk_size)
+    ])
+    return "".join(parts)
+
+
+def _parse_docx(stream: BinaryIO) -> str:
+    """Extract text from an uploaded DOCX (blocking)."""
+    try:
+        import docx
+    except ImportError:
+        raise HTTPException(
+            status_code=500,
+            detail="DOCX parsing library not available. Please install python-docx."
+        )
+    
+    doc = docx.Document(stream)
+    extracted_text = ""
+    for para in doc.paragraphs:
+        extracted_text += para.text + "\n"
+    return extracted_text
+
+
 @app.post("/parse-resume", response_model=ResumeParseResponse)
 async def parse_resume(file: UploadFile = File(...)):
     """
@@ -518,50 +718,23 @@ async def parse_resume(file: UploadFile = File(...)):
                 detail="Invalid file type. Please upload a PDF or DOCX file."
             )
         
-        # Read file content
-        content = await file.read()
-        
-        # Validate file size (5MB max)
-        if len(content) > 5 * 1024 * 1024:
+        # Starlette has already spooled the upload to a temp file, so check its
+        # size and hand the file object to the parsers instead of copying it
+        size = file.size
+        if size is None:
+            size = await _run_in_parse_pool(file.file.seek, 0, os.SEEK_END)
+        if size > MAX_RESUME_SIZE:
             raise HTTPException(
-                status_code=400,
+                status_code=413,
                 detail="File size must be less than 5MB."
             )
+        await file.seek(0)
         
-        extracted_text = ""
-        
+        # Parsing is synchronous CPU work, so keep it off the event loop
         if file_ext == 'pdf':
-            # Parse PDF
-            try:
-                import pypdf
-                pdf_reader = pypdf.PdfReader(io.BytesIO(content))
-                for page in pdf_reader.pages:
-                    extracted_text += page.extract_text() or ""
-            except ImportError:
-                # Fallback: Try PyPDF2
-                try:
-                    import PyPDF2
-                    pdf_reader = PyPDF2.PdfReader(io.BytesIO(content))
-                    for page in pdf_reader.pages:
-                        extracted_text += page.extract_text() or ""
-                except ImportError:
-                    raise HTTPException(
-                        status_code=500,
-                        detail="PDF parsing library not available. Please install pypdf or PyPDF2."
-                    )
-        
-        elif file_ext in ['docx', 'doc']:
-            # Parse DOCX
-            try:
-                import docx
-                doc = docx.Document(io.BytesIO(content))
-                for para in doc.paragraphs:
-                    extracted_text += para.text + "\n"
-            except ImportError:
-                raise HTTPException(
-                    status_code=500,
-                    detail="DOCX parsing library not available. Please install python-docx."
-                )
+            extracted_text = await _parse_pdf(file.file)
+        else:
+            extracted_text = await _run_in_parse_pool(_parse_docx, file.file)
         
         # Clean up text
         extracted_text = extracted_text.strip()
@@ -592,8 +765,11 @@ async def parse_resume(file: UploadFile = File(...)):
 
 # ============ Stage 1: Career Matching Endpoint ============
 
+# Speculatively run MarketScout for all 3 fits after /analyze (3x market LLM calls)
+PREFETCH_MARKET_INSIGHTS = os.getenv("PREFETCH_MARKET_INSIGHTS", "true").lower() == "true"
+
 @app.post("/analyze", response_model=CareerMatchingResponse)
-async def analyze_career_fits(request: SimulationRequest):
+async def analyze_career_fits(request: SimulationRequest, background_tasks: BackgroundTasks):
     """
     Stage 1: Analyze profile and return top 3 career fits.
     
@@ -610,20 +786,26 @@ async def analyze_career_fits(request: SimulationRequest):
     start_time = time.time()
     
     try:
-        # Run Stage 1: Career Matching
-        result = await run_career_matching_async(request.profile)
+        # Identical profiles reuse a cached Stage 1 result (still get a fresh session)
+        cache_key = _profile_cache_key(request.profile) if ANALYZE_CACHE_ENABLED else None
+        result = await get_cached_analysis(cache_key) if cache_key else None
+        if result is None:
+            # Run Stage 1: Career Matching
+            result = await run_career_matching_async(request.profile)
+            if cache_key and result.get("career_matcher_result") and not result.get("errors"):
+                await cache_analysis(cache_key, result)
         
         processing_time = (time.time() - start_time) * 1000
         
         # Generate session ID
-        session_id = f"session_{int(time.time())}_{id(result) % 10000}"
+        session_id = f"session_{secrets.token_urlsafe(16)}"
         
         # Store session for Stage 2
-        _session_store[session_id] = {
+        await save_session(session_id, {
             "state": result,
             "profile": request.profile,
             "created_at": time.time(),
-        }
+        })
         
         # Extract career matcher result
         matcher_result = result.get("career_matcher_result")
@@ -633,35 +815,14 @@ async def analyze_career_fits(request: SimulationRequest):
                 detail="Career matching failed to produce results"
             )
         
-        # Format career fits for response
-        career_fits_response = []
-        for fit in matcher_result.career_fits:
-            career_fits_response.append(CareerFitResponse(
-                rank=fit.rank,
-                career_title=fit.career_title,
-                career_field=fit.career_field,
-                overall_fit_score=fit.overall_fit_score,
-                skill_fit_score=fit.skill_fit_score,
-                interest_fit_score=fit.interest_fit_score,
-                market_fit_score=fit.market_fit_score,
-                personality_fit_score=fit.personality_fit_score,
-                tagline=fit.tagline,
-                reasoning=CareerFitReasoningResponse(
-                    strengths_alignment=fit.reasoning.strengths_alignment,
-                    interest_match=fit.reasoning.interest_match,
-                    skill_transferability=fit.reasoning.skill_transferability,
-                    growth_potential_reasons=fit.reasoning.growth_potential_reasons,
-                    market_demand_reasons=fit.reasoning.market_demand_reasons,
-                    potential_challenges=fit.reasoning.potential_challenges,
-                    why_now=fit.reasoning.why_now,
-                ),
-                typical_salary_range=fit.typical_salary_range,
-                time_to_entry=fit.time_to_entry,
-                difficulty_level=fit.difficulty_level,
-                top_3_reasons=fit.top_3_reasons,
-                key_skills_needed=fit.key_skills_needed,
-                immediate_next_steps=fit.immediate_next_steps,
-            ))
+        # Format career fits for response (CareerFitResponse mirrors CareerFit)
+        career_fits_response = [
+            CareerFitResponse.model_validate(fit) for fit in matcher_result.career_fits
+        ]
+        
+        # Warm MarketScout for all fits while the user picks one
+        if PREFETCH_MARKET_INSIGHTS:
+            background_tasks.add_task(_prefetch_market, session_id, result, matcher_result.career_fits)
         
         return CareerMatchingResponse(
             success=True,
@@ -683,6 +844,24 @@ async def analyze_career_fits(request: SimulationRequest):
         )
 
 
+def _profile_cache_key(profile: dict) -> str:
+    """Content hash of the canonical (key-sorted) profile JSON."""
+    return hashlib.blake2b(orjson.dumps(profile, option=orjson.OPT_SORT_KEYS), digest_size=16).hexdigest()
+
+
+async def _prefetch_market(session_id: str, state: CareerSimulationState, career_fits: list[CareerFit]):
+    """Background task: prefetch market insights and attach them to the session."""
+    prefetched = await prefetch_market_insights(state, career_fits)
+    
+    # Session may already be consumed or expired by the time the prefetch finishes
+    session = await get_session(session_id)
+    if not session or not prefetched:
+        return
+    session["prefetched_market"] = prefetched
+    if await update_session(session_id, session):
+        print(f"🔮 Prefetched market insights for {len(prefetched)} career(s) in {session_id}")
+
+
 # ============ Stage 2: Full Simulation Endpoint ============
 
 @app.post("/simulate/selected", response_model=SimulationResponse)
@@ -711,8 +890,140 @@ async def simulate_selected_career(
     """
     start_time = time.time()
     
+    session, user_id = await _load_selection(request, http_request, access_token)
+    
+    try:
+        # Get state from session
+        state = session["state"]
+        
+        # Run Stage 2: Full Simulation
+        result = await run_career_simulation_for_selected_async(
+            state,
+            request.career_index,
+            prefetched_market=session.get("prefetched_market"),
+        )
+        
+        processing_time = (time.time() - start_time) * 1000
+        
+        # Clean up session
+        await delete_session(request.session_id)
+        
+        return await _build_selected_response(result, user_id, processing_time)
+        
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Simulation failed: {str(e)}"
+        )
+
+
+@app.post("/simulate/selected/stream")
+async def simulate_selected_career_stream(
+    request: SelectCareerRequest,
+    http_request: Request,
+    access_token: Optional[str] = Cookie(None)
+):
+    """
+    Stage 2 (streaming): Same pipeline as /simulate/selected, sent as Server-Sent Events.
+    
+    Emits one event per agent as it completes (event name = node id, data =
+    that agent's state update), then a final `complete` event carrying the
+    same payload as /simulate/selected. Failures are reported as an `error` event.
+    """
+    start_time = time.time()
+    
+    session, user_id = await _load_selection(request, http_request, access_token)
+    
+    async def event_stream():
+        try:
+            async for node_name, payload in stream_career_simulation_for_selected(
+                session["state"],
+                request.career_index,
+                prefetched_market=session.get("prefetched_market"),
+            ):
+                if node_name != "complete":
+                    yield _sse_event(node_name, payload)
+                    continue
+                
+                processing_time = (time.time() - start_time) * 1000
+                await delete_session(request.session_id)
+                response = await _build_selected_response(payload, user_id, processing_time)
+                yield _sse_event("complete", response)
+        except Exception as e:
+            yield _sse_event("error", {"detail": f"Simulation failed: {str(e)}"})
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.post("/simulate/selected/batch", response_model=list[SimulationResponse])
+async def simulate_selected_careers_batch(request: BatchSelectCareerRequest):
+    """
+    Stage 2 (compare): Run the full simulation for several career fits concurrently.
+    
+    Each selected fit runs on its own copy of the Stage 1 state, so the
+    parsed profile and career matches are shared rather than recomputed.
+    Results come back in the order of career_indices.
+    
+    The session is kept so the user can still pick one career via
+    /simulate/selected; no roadmap is saved for comparison runs.
+    """
+    start_time = time.time()
+    
+    session = await get_session(request.session_id)
+    if not session:
+        raise HTTPException(
+            status_code=404,
+            detail="Session not found. Please run /analyze first."
+        )
+    
+    career_indices = list(dict.fromkeys(request.career_indices))
+    if not career_indices or any(i < 0 or i > 2 for i in career_indices):
+        raise HTTPException(
+            status_code=400,
+            detail="career_indices must contain values 0, 1, or 2"
+        )
+    
+    try:
+        # Each run works on its own shallow copy of the session state
+        results = await asyncio.gather(*[
+            run_career_simulation_for_selected_async(
+                session["state"],
+                index,
+                prefetched_market=session.get("prefetched_market"),
+            )
+            for index in career_indices
+        ])
+        
+        processing_time = (time.time() - start_time) * 1000
+        
+        return [
+            await _build_selected_response(result, None, processing_time)
+            for result in results
+        ]
+        
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Simulation failed: {str(e)}"
+        )
+
+
+async def _load_selection(
+    request: SelectCareerRequest,
+    http_request: Request,
+    access_token: Optional[str],
+) -> tuple[dict, Optional[str]]:
+    """Load the Stage 1 session for a career selection and resolve the user ID."""
     # Get session
-    session = _session_store.get(request.session_id)
+    session = await get_session(request.session_id)
     if not session:
         raise HTTPException(
             status_code=404,
@@ -738,88 +1049,82 @@ async def simulate_selected_career(
     if not user_id:
         print(f"⚠️ No user_id found - check Authorization header or access_token cookie")
     
-    try:
-        # Get state from session
-        state = session["state"]
-        
-        # Run Stage 2: Full Simulation
-        result = await run_career_simulation_for_selected_async(state, request.career_index)
-        
-        processing_time = (time.time() - start_time) * 1000
-        
-        # Clean up session
-        del _session_store[request.session_id]
-        
-        # Format response
-        dashboard_data = result.get("dashboard_data")
-        financial = result.get("financial_analysis")
-        risk = result.get("risk_assessment")
-        gap = result.get("gap_analysis")
-        selected = result.get("selected_career")
-        
-        # Include selected career info in summary
-        summary = _extract_summary(result)
-        selected_career_info = None
-        if selected:
-            selected_career_info = {
-                "title": selected.career_title,
-                "field": selected.career_field,
-                "fit_score": selected.overall_fit_score,
-                "tagline": getattr(selected, 'tagline', ''),
-                "difficulty_level": getattr(selected, 'difficulty_level', ''),
-                "time_to_entry": getattr(selected, 'time_to_entry', ''),
-                "typical_salary_range": getattr(selected, 'typical_salary_range', ''),
+    return session, user_id
+
+
+async def _build_selected_response(
+    result: CareerSimulationState,
+    user_id: Optional[str],
+    processing_time: float,
+) -> SimulationResponse:
+    """Format a finished Stage 2 state and save the roadmap for authenticated users."""
+    selected = result.get("selected_career")
+    
+    # Include selected career info in summary
+    summary = _extract_summary(result)
+    selected_career_info = None
+    if selected:
+        selected_career_info = {
+            "title": selected.career_title,
+            "field": selected.career_field,
+            "fit_score": selected.overall_fit_score,
+            "tagline": getattr(selected, 'tagline', ''),
+            "difficulty_level": getattr(selected, 'difficulty_level', ''),
+            "time_to_entry": getattr(selected, 'time_to_entry', ''),
+            "typical_salary_range": getattr(selected, 'typical_salary_range', ''),
+        }
+        summary["selected_career"] = selected_career_info
+    
+    # Save roadmap to database if user is authenticated
+    print(f"📝 Attempting to save roadmap. user_id={user_id}")
+    if user_id:
+        try:
+            roadmap_data = {
+                "selected_career": selected_career_info,
+                "dashboard_data": _dump_model(result.get("dashboard_data")),
+                "timeline": _dump_model(result.get("timeline_simulation")),
+                "financial_analysis": _dump_model(result.get("financial_analysis")),
+                "risk_assessment": _dump_model(result.get("risk_assessment")),
+                "gap_analysis": _dump_model(result.get("gap_analysis")),
+                "summary": summary,
             }
-            summary["selected_career"] = selected_career_info
-        
-        # Prepare timeline data
-        timeline_data = _extract_timeline(result)
-        
-        # Save roadmap to database if user is authenticated
-        print(f"📝 Attempting to save roadmap. user_id={user_id}")
-        if user_id:
-            try:
-                roadmap_data = {
-                    "selected_career": selected_career_info,
-                    "dashboard_data": dashboard_data.model_dump() if dashboard_data else None,
-                    "timeline": timeline_data,
-                    "financial_analysis": financial.model_dump() if financial else None,
-                    "risk_assessment": risk.model_dump() if risk else None,
-                    "gap_analysis": gap.model_dump() if gap else None,
-                    "summary": summary,
-                }
-                print(f"📝 Roadmap data prepared, calling save_career_roadmap...")
-                roadmap_save_result = await save_career_roadmap(roadmap_data, user_id)
-                print(f"✅ Roadmap saved for user {user_id}: {roadmap_save_result['message']}")
-            except Exception as save_error:
-                print(f"⚠️ Failed to save roadmap: {save_error}")
-                import traceback
-                traceback.print_exc()
-                # Don't fail the request if roadmap save fails
-        else:
-            print(f"⚠️ No user_id available, roadmap NOT saved to database")
-        
-        return SimulationResponse(
-            success=True,
-            simulation_id=f"sim_{int(time.time())}",
-            processing_time_ms=processing_time,
-            summary=summary,
-            dashboard_data=dashboard_data.model_dump() if dashboard_data else None,
-            timeline=timeline_data,
-            financial_analysis=financial.model_dump() if financial else None,
-            risk_assessment=risk.model_dump() if risk else None,
-            gap_analysis=gap.model_dump() if gap else None,
-            warnings=result.get("warnings", []),
-            errors=result.get("errors", []),
-        )
-        
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Simulation failed: {str(e)}"
-        )
+            print(f"📝 Roadmap data prepared, calling save_career_roadmap...")
+            roadmap_save_result = await save_career_roadmap(roadmap_data, user_id)
+            print(f"✅ Roadmap saved for user {user_id}: {roadmap_save_result['message']}")
+        except Exception as save_error:
+            print(f"⚠️ Failed to save roadmap: {save_error}")
+            import traceback
+            traceback.print_exc()
+            # Don't fail the request if roadmap save fails
+    else:
+        print(f"⚠️ No user_id available, roadmap NOT saved to database")
+    
+    return SimulationResponse(
+        success=True,
+        simulation_id=f"sim_{secrets.token_urlsafe(16)}",
+        processing_time_ms=processing_time,
+        summary=summary,
+        dashboard_data=result.get("dashboard_data"),
+        timeline=result.get("timeline_simulation"),
+        financial_analysis=result.get("financial_analysis"),
+        risk_assessment=result.get("risk_assessment"),
+        gap_analysis=result.get("gap_analysis"),
+        warnings=result.get("warnings", []),
+        errors=result.get("errors", []),
+    )
+
+
+def _sse_event(event: str, payload) -> bytes:
+    """Encode one Server-Sent Event; pydantic models are dumped to JSON."""
+    data = orjson.dumps(payload, default=_orjson_default)
+    return b"event: " + event.encode() + b"\ndata: " + data + b"\n\n"
+
+
+def _orjson_default(obj):
+    """orjson fallback for values it cannot serialize natively."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
 
 
 # ============ Legacy Endpoint (Single-Stage) ============
@@ -845,22 +1150,17 @@ async def simulate_career(request: SimulationRequest):
         
         processing_time = (time.time() - start_time) * 1000
         
-        # Format response (result is now a dict/TypedDict)
-        dashboard_data = result.get("dashboard_data")
-        financial = result.get("financial_analysis")
-        risk = result.get("risk_assessment")
-        gap = result.get("gap_analysis")
-        
+        # Format response; nested models are serialized once by FastAPI
         response = SimulationResponse(
             success=True,
-            simulation_id=f"sim_{int(time.time())}",
+            simulation_id=f"sim_{secrets.token_urlsafe(16)}",
             processing_time_ms=processing_time,
             summary=_extract_summary(result),
-            dashboard_data=dashboard_data.model_dump() if dashboard_data else None,
-            timeline=_extract_timeline(result),
-            financial_analysis=financial.model_dump() if financial else None,
-            risk_assessment=risk.model_dump() if risk else None,
-            gap_analysis=gap.model_dump() if gap else None,
+            dashboard_data=result.get("dashboard_data"),
+            timeline=result.get("timeline_simulation"),
+            financial_analysis=result.get("financial_analysis"),
+            risk_assessment=result.get("risk_assessment"),
+            gap_analysis=result.get("gap_analysis"),
             warnings=result.get("warnings", []),
             errors=result.get("errors", []),
         )
@@ -888,11 +1188,15 @@ async def simulate_career_sync(request: SimulationRequest):
         
         processing_time = (time.time() - start_time) * 1000
         
-        return {
-            "success": True,
-            "processing_time_ms": processing_time,
-            "result": _state_to_dict(result),
-        }
+        # Debug path: encode straight to bytes, dumping nested models lazily
+        return Response(
+            content=orjson.dumps({
+                "success": True,
+                "processing_time_ms": processing_time,
+                "result": _state_to_dict(result),
+            }, default=_orjson_default),
+            media_type="application/json",
+        )
         
     except Exception as e:
         raise HTTPException(
@@ -954,6 +1258,11 @@ async def get_graph_info():
 
 # Helper functions
 
+def _dump_model(model: Optional[BaseModel]) -> dict | None:
+    """Dump a pydantic model to JSON-compatible primitives in a single pass."""
+    return model.model_dump(mode="json") if model is not None else None
+
+
 def _extract_summary(result: dict) -> dict:
     """Extract key summary statistics from simulation result"""
     summary = {}
@@ -987,58 +1296,36 @@ def _extract_summary(result: dict) -> dict:
     timeline_simulation = result.get("timeline_simulation")
     if timeline_simulation:
         summary["recommended_path"] = timeline_simulation.recommended_path
-        if timeline_simulation.realistic_path:
-            summary["timeline_years"] = timeline_simulation.realistic_path.total_years
-            summary["target_role"] = timeline_simulation.realistic_path.final_target_role
+        realistic_path = timeline_simulation.realistic_path
+        if realistic_path:
+            summary["timeline_years"] = realistic_path.total_years
+            summary["target_role"] = realistic_path.final_target_role
     
     return summary
 
 
-def _extract_timeline(result: dict) -> dict | None:
-    """Extract timeline simulation data"""
-    timeline = result.get("timeline_simulation")
-    if not timeline:
-        return None
-    
-    return {
-        "recommended_path": timeline.recommended_path,
-        "recommendation_reason": timeline.recommendation_reason,
-        "alignment_score": timeline.alignment_score,
-        "vibe_check_warnings": timeline.vibe_check_warnings,
-        "conservative_path": timeline.conservative_path.model_dump() if timeline.conservative_path else None,
-        "realistic_path": timeline.realistic_path.model_dump() if timeline.realistic_path else None,
-        "ambitious_path": timeline.ambitious_path.model_dump() if timeline.ambitious_path else None,
-    }
+# State keys returned by /simulate/sync, with defaults for keys a run never set
+_STATE_RESPONSE_DEFAULTS = {
+    "career_profile": None,
+    "normalized_profile": None,
+    "market_insights": None,
+    "gap_analysis": None,
+    "alternative_careers": [],
+    "timeline_simulation": None,
+    "financial_analysis": None,
+    "risk_assessment": None,
+    "dashboard_data": None,
+    "simulation_complete": False,
+    "final_report_summary": "",
+    "warnings": [],
+    "errors": [],
+    "processing_time_ms": {},
+}
 
 
 def _state_to_dict(state: dict) -> dict:
-    """Convert CareerSimulationState dict to serializable dictionary"""
-    career_profile = state.get("career_profile")
-    normalized_profile = state.get("normalized_profile")
-    market_insights = state.get("market_insights")
-    gap_analysis = state.get("gap_analysis")
-    timeline_simulation = state.get("timeline_simulation")
-    financial_analysis = state.get("financial_analysis")
-    risk_assessment = state.get("risk_assessment")
-    dashboard_data = state.get("dashboard_data")
-    alternative_careers = state.get("alternative_careers", [])
-    
-    return {
-        "career_profile": career_profile.model_dump() if career_profile else None,
-        "normalized_profile": normalized_profile.model_dump() if normalized_profile else None,
-        "market_insights": market_insights.model_dump() if market_insights else None,
-        "gap_analysis": gap_analysis.model_dump() if gap_analysis else None,
-        "alternative_careers": [a.model_dump() for a in alternative_careers],
-        "timeline_simulation": timeline_simulation.model_dump() if timeline_simulation else None,
-        "financial_analysis": financial_analysis.model_dump() if financial_analysis else None,
-        "risk_assessment": risk_assessment.model_dump() if risk_assessment else None,
-        "dashboard_data": dashboard_data.model_dump() if dashboard_data else None,
-        "simulation_complete": state.get("simulation_complete", False),
-        "final_report_summary": state.get("final_report_summary", ""),
-        "warnings": state.get("warnings", []),
-        "errors": state.get("errors", []),
-        "processing_time_ms": state.get("processing_time_ms", {}),
-    }
+    """Convert CareerSimulationState dict to a response dictionary (models are encoded by FastAPI)"""
+    return {key: state.get(key, default) for key, default in _STATE_RESPONSE_DEFAULTS.items()}
 
 
 # ============ LiveKit Voice Agent Endpoints ============
@@ -1152,11 +1439,20 @@ if __name__ == "__main__":
     
     port = int(os.getenv("PORT", 8000))
     host = os.getenv("HOST", "0.0.0.0")
+    reload = os.getenv("RELOAD", "false").lower() == "true"
+    
+    # Sessions are only shared across workers when Redis is configured
+    default_workers = (os.cpu_count() or 1) if os.getenv("REDIS_URL") else 1
+    workers = 1 if reload else int(os.getenv("WEB_CONCURRENCY", default_workers))
+    if workers > 1 and not os.getenv("REDIS_URL"):
+        print("⚠️ REDIS_URL not set, forcing a single worker so sessions stay in one process")
+        workers = 1
     
-    print(f"🚀 Starting Career Path Simulator on {host}:{port}")
+    print(f"🚀 Starting Career Path Simulator on {host}:{port} ({workers} worker(s))")
     uvicorn.run(
         "main:app",
         host=host,
         port=port,
-        reload=True,
+        reload=reload,
+        workers=workers,
     )
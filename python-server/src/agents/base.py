@@ -4,64 +4,166 @@ Shared utilities and base classes for all agents
 """
 
 import os
+import importlib.util
+from dataclasses import dataclass
+from datetime import date, datetime
+from functools import lru_cache
 from typing import Optional
-from langchain_openai import ChatOpenAI
-from langchain_anthropic import ChatAnthropic
-from langchain_groq import ChatGroq
+import httpx
 from langchain_core.language_models.chat_models import BaseChatModel
 from dotenv import load_dotenv
 
 load_dotenv()
 
 
-def get_llm(
-    model_type: str = None,
-    model_name: Optional[str] = None,
-    temperature: float = 0.7,
-) -> BaseChatModel:
+_LLM_ENV_KEYS = (
+    "DEFAULT_LLM_TYPE",
+    "GROQ_MODEL",
+    "GROQ_API_KEY",
+    "OPENAI_MODEL",
+    "OPENAI_API_KEY",
+    "ANTHROPIC_MODEL",
+    "ANTHROPIC_API_KEY",
+)
+
+
+@lru_cache(maxsize=1)
+def _llm_env() -> dict[str, Optional[str]]:
     """
-    Get configured LLM instance.
+    Snapshot the LLM settings on first use.
     
-    Args:
-        model_type: "groq", "openai", or "anthropic"
-        model_name: Specific model name (optional)
-        temperature: Model temperature
-        
-    Returns:
-        Configured chat model instance
+    Taken lazily rather than at import so env files loaded later by the
+    entrypoint (e.g. .env.local in main.py) are still picked up.
     """
+    return {key: os.getenv(key) for key in _LLM_ENV_KEYS}
+
+
+def refresh_env() -> None:
+    """Re-read LLM settings from the environment and drop cached clients."""
+    _llm_env.cache_clear()
+    _build_llm.cache_clear()
+
+
+def _resolve_llm(model_type: Optional[str], model_name: Optional[str]) -> tuple[str, str]:
+    """Resolve env defaults into a concrete (model_type, model_name) pair."""
+    env = _llm_env()
     # Use default from env if not specified
     if model_type is None:
-        model_type = os.getenv("DEFAULT_LLM_TYPE", "groq")
+        model_type = env["DEFAULT_LLM_TYPE"] or "groq"
     
     if model_type == "groq":
+        return model_type, model_name or env["GROQ_MODEL"] or "openai/gpt-oss-20b"
+    elif model_type == "openai":
+        return model_type, model_name or env["OPENAI_MODEL"] or "gpt-4o-mini"
+    elif model_type == "anthropic":
+        return model_type, model_name or env["ANTHROPIC_MODEL"] or "claude-3-5-sonnet-20241022"
+    else:
+        raise ValueError(f"Unsupported model type: {model_type}")
+
+
+# Connection pool shared by the OpenAI-compatible SDKs (Groq, OpenAI); the httpx
+# default of 10 connections queues concurrent /analyze requests
+LLM_HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+
+
+@lru_cache(maxsize=1)
+def _http_clients() -> tuple[httpx.Client, httpx.AsyncClient]:
+    """One sync and one async pooled client shared by every Groq/OpenAI model."""
+    # HTTP/2 multiplexes requests over one connection; it needs the h2 extra
+    http2 = importlib.util.find_spec("h2") is not None
+    timeout = httpx.Timeout(DEFAULT_AGENT_CONFIG.timeout_seconds)
+    return (
+        httpx.Client(http2=http2, limits=LLM_HTTP_LIMITS, timeout=timeout),
+        httpx.AsyncClient(http2=http2, limits=LLM_HTTP_LIMITS, timeout=timeout),
+    )
+
+
+@lru_cache(maxsize=32)
+def _build_llm(
+    model_type: str,
+    model_name: str,
+    temperature: float,
+    timeout: Optional[float] = None,
+    max_retries: Optional[int] = None,
+) -> BaseChatModel:
+    """Construct a chat model once per configuration; API keys stay out of the cache key."""
+    # Only override the SDK's own retry count when asked, e.g. under with_retry
+    retry_kwargs = {} if max_retries is None else {"max_retries": max_retries}
+    # Provider SDKs are imported lazily so only the configured one is loaded
+    if model_type == "groq":
+        from langchain_groq import ChatGroq
+        http_client, http_async_client = _http_clients()
         return ChatGroq(
-            model=model_name or os.getenv("GROQ_MODEL", "openai/gpt-oss-20b"),
+            model=model_name,
             temperature=temperature,
-            api_key=os.getenv("GROQ_API_KEY"),
+            api_key=_llm_env()["GROQ_API_KEY"],
+            timeout=timeout or DEFAULT_AGENT_CONFIG.timeout_seconds,
+            http_client=http_client,
+            http_async_client=http_async_client,
+            **retry_kwargs,
         )
     elif model_type == "openai":
+        from langchain_openai import ChatOpenAI
+        http_client, http_async_client = _http_clients()
         return ChatOpenAI(
-            model=model_name or os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
+            model=model_name,
             temperature=temperature,
-            api_key=os.getenv("OPENAI_API_KEY"),
+            api_key=_llm_env()["OPENAI_API_KEY"],
+            timeout=timeout or DEFAULT_AGENT_CONFIG.timeout_seconds,
+            http_client=http_client,
+            http_async_client=http_async_client,
+            **retry_kwargs,
         )
-    elif model_type == "anthropic":
+    else:
+        # Anthropic keeps its SDK's own HTTP/1.1 client
+        from langchain_anthropic import ChatAnthropic
         return ChatAnthropic(
-            model=model_name or os.getenv("ANTHROPIC_MODEL", "claude-3-5-sonnet-20241022"),
+            model=model_name,
             temperature=temperature,
-            api_key=os.getenv("ANTHROPIC_API_KEY"),
+            api_key=_llm_env()["ANTHROPIC_API_KEY"],
+            **({} if timeout is None else {"timeout": timeout}),
+            **retry_kwargs,
         )
-    else:
-        raise ValueError(f"Unsupported model type: {model_type}")
+
+
+def get_llm(
+    model_type: str = None,
+    model_name: Optional[str] = None,
+    temperature: float = 0.7,
+    timeout: Optional[float] = None,
+    max_retries: Optional[int] = None,
+) -> BaseChatModel:
+    """
+    Get configured LLM instance.
+    
+    Instances are shared per configuration so every agent reuses the same
+    HTTP client and its keep-alive connections.
+    
+    Args:
+        model_type: "groq", "openai", or "anthropic"
+        model_name: Specific model name (optional)
+        temperature: Model temperature
+        timeout: Per-request timeout in seconds (optional)
+        max_retries: SDK-level retry count (optional, SDK default if None)
+        
+    Returns:
+        Configured chat model instance
+    """
+    model_type, model_name = _resolve_llm(model_type, model_name)
+    return _build_llm(model_type, model_name, temperature, timeout, max_retries)
+
+
+# Drop cached clients (e.g. after changing API keys in tests)
+get_llm.cache_clear = _build_llm.cache_clear
 
 
 # Default LLM for agents
 DEFAULT_LLM_TYPE = os.getenv("DEFAULT_LLM_TYPE", "groq")
 
 
+@dataclass(frozen=True, slots=True)
 class AgentConfig:
-    """Configuration for agents"""
+    """Configuration for agents (immutable, so one instance is shared)"""
     
     # Model settings
     llm_type: str = DEFAULT_LLM_TYPE
@@ -75,52 +177,58 @@ class AgentConfig:
     timeout_seconds: int = 60
 
 
+DEFAULT_AGENT_CONFIG = AgentConfig()
+
+
 # Mapping of major fields to typically associated technical skills
-MAJOR_TO_SKILLS_MAP = {
+MAJOR_TO_SKILLS_MAP: dict[str, tuple[str, ...]] = {
     # Computer Science & Engineering
-    "computer science": ["Programming", "Data Structures", "Algorithms", "Software Development"],
-    "cs": ["Programming", "Data Structures", "Algorithms", "Software Development"],
-    "software engineering": ["Programming", "Software Development", "System Design", "Testing"],
-    "information technology": ["Programming", "Networking", "Database Management", "System Administration"],
-    "it": ["Programming", "Networking", "Database Management", "System Administration"],
-    "data science": ["Python", "Statistics", "Machine Learning", "Data Analysis"],
-    "artificial intelligence": ["Python", "Machine Learning", "Deep Learning", "Mathematics"],
-    "ai": ["Python", "Machine Learning", "Deep Learning", "Mathematics"],
-    "machine learning": ["Python", "Statistics", "Deep Learning", "Mathematics"],
-    "cybersecurity": ["Networking", "Security Tools", "Linux", "Cryptography"],
+    "computer science": ("Programming", "Data Structures", "Algorithms", "Software Development"),
+    "cs": ("Programming", "Data Structures", "Algorithms", "Software Development"),
+    "software engineering": ("Programming", "Software Development", "System Design", "Testing"),
+    "information technology": ("Programming", "Networking", "Database Management", "System Administration"),
+    "it": ("Programming", "Networking", "Database Management", "System Administration"),
+    "data science": ("Python", "Statistics", "Machine Learning", "Data Analysis"),
+    "artificial intelligence": ("Python", "Machine Learning", "Deep Learning", "Mathematics"),
+    "ai": ("Python", "Machine Learning", "Deep Learning", "Mathematics"),
+    "machine learning": ("Python", "Statistics", "Deep Learning", "Mathematics"),
+    "cybersecurity": ("Networking", "Security Tools", "Linux", "Cryptography"),
     
     # Engineering
-    "electrical engineering": ["Circuit Design", "Electronics", "Signal Processing", "MATLAB"],
-    "ee": ["Circuit Design", "Electronics", "Signal Processing", "MATLAB"],
-    "mechanical engineering": ["CAD", "Thermodynamics", "Materials Science", "Manufacturing"],
-    "me": ["CAD", "Thermodynamics", "Materials Science", "Manufacturing"],
-    "civil engineering": ["AutoCAD", "Structural Analysis", "Project Management", "Surveying"],
-    "chemical engineering": ["Process Design", "Chemistry", "MATLAB", "Process Control"],
+    "electrical engineering": ("Circuit Design", "Electronics", "Signal Processing", "MATLAB"),
+    "ee": ("Circuit Design", "Electronics", "Signal Processing", "MATLAB"),
+    "mechanical engineering": ("CAD", "Thermodynamics", "Materials Science", "Manufacturing"),
+    "me": ("CAD", "Thermodynamics", "Materials Science", "Manufacturing"),
+    "civil engineering": ("AutoCAD", "Structural Analysis", "Project Management", "Surveying"),
+    "chemical engineering": ("Process Design", "Chemistry", "MATLAB", "Process Control"),
     
     # Business & Management
-    "business administration": ["Business Strategy", "Management", "Financial Analysis", "Marketing"],
-    "mba": ["Business Strategy", "Leadership", "Financial Analysis", "Operations"],
-    "finance": ["Financial Modeling", "Excel", "Accounting", "Investment Analysis"],
-    "marketing": ["Digital Marketing", "Market Research", "Analytics", "Content Strategy"],
-    "economics": ["Statistical Analysis", "Economic Modeling", "Data Analysis", "Research"],
+    "business administration": ("Business Strategy", "Management", "Financial Analysis", "Marketing"),
+    "mba": ("Business Strategy", "Leadership", "Financial Analysis", "Operations"),
+    "finance": ("Financial Modeling", "Excel", "Accounting", "Investment Analysis"),
+    "marketing": ("Digital Marketing", "Market Research", "Analytics", "Content Strategy"),
+    "economics": ("Statistical Analysis", "Economic Modeling", "Data Analysis", "Research"),
     
     # Sciences
-    "physics": ["Mathematics", "Data Analysis", "Programming", "Research Methods"],
-    "chemistry": ["Lab Techniques", "Data Analysis", "Research Methods", "Technical Writing"],
-    "biology": ["Lab Techniques", "Data Analysis", "Research Methods", "Bioinformatics"],
-    "mathematics": ["Mathematical Modeling", "Statistics", "Programming", "Problem Solving"],
+    "physics": ("Mathematics", "Data Analysis", "Programming", "Research Methods"),
+    "chemistry": ("Lab Techniques", "Data Analysis", "Research Methods", "Technical Writing"),
+    "biology": ("Lab Techniques", "Data Analysis", "Research Methods", "Bioinformatics"),
+    "mathematics": ("Mathematical Modeling", "Statistics", "Programming", "Problem Solving"),
     
     # Healthcare
-    "medicine": ["Clinical Skills", "Patient Care", "Medical Knowledge", "Research"],
-    "nursing": ["Patient Care", "Clinical Skills", "Healthcare Management", "Communication"],
-    "pharmacy": ["Pharmaceutical Knowledge", "Patient Counseling", "Healthcare Regulations", "Chemistry"],
+    "medicine": ("Clinical Skills", "Patient Care", "Medical Knowledge", "Research"),
+    "nursing": ("Patient Care", "Clinical Skills", "Healthcare Management", "Communication"),
+    "pharmacy": ("Pharmaceutical Knowledge", "Patient Counseling", "Healthcare Regulations", "Chemistry"),
     
     # Design & Arts
-    "graphic design": ["Adobe Creative Suite", "UI Design", "Visual Communication", "Typography"],
-    "ux design": ["User Research", "Wireframing", "Prototyping", "Usability Testing"],
-    "ui design": ["Visual Design", "Prototyping", "Design Systems", "HTML/CSS"],
+    "graphic design": ("Adobe Creative Suite", "UI Design", "Visual Communication", "Typography"),
+    "ux design": ("User Research", "Wireframing", "Prototyping", "Usability Testing"),
+    "ui design": ("Visual Design", "Prototyping", "Design Systems", "HTML/CSS"),
 }
 
+# Snapshot for the substring fallback in infer_skills_from_major
+_MAJOR_SKILL_ITEMS = tuple(MAJOR_TO_SKILLS_MAP.items())
+
 # Grading scale normalization
 GRADING_SCALES = {
     "4.0": {"max": 4.0, "excellent": 3.7, "good": 3.0, "average": 2.5},
@@ -131,6 +239,19 @@ GRADING_SCALES = {
 }
 
 
+# Multiplier from raw GPA to the 0-100 scale for every known scale identifier
+_GPA_MULTIPLIERS = {key: 100.0 / values["max"] for key, values in GRADING_SCALES.items()}
+_GPA_MULTIPLIERS.update({
+    "4": 25.0,
+    "10": 10.0,
+    "cgpa": 10.0,
+    "100": 1.0,  # Sent by the frontend for "Percentage"
+    "100.0": 1.0,
+    "percent": 1.0,
+    "%": 1.0,
+})
+
+
 def normalize_gpa(gpa: float, scale: str) -> float:
     """
     Normalize GPA to 0-100 scale.
@@ -142,18 +263,22 @@ def normalize_gpa(gpa: float, scale: str) -> float:
     Returns:
         Normalized GPA (0-100)
     """
-    scale_lower = scale.lower() if scale else "4.0"
+    scale_lower = scale.lower().strip() if scale else "4.0"
+    
+    multiplier = _GPA_MULTIPLIERS.get(scale_lower)
+    if multiplier is not None:
+        return gpa * multiplier
     
-    # Find matching scale
+    # Free-form scale labels: fall back to substring matching
     for scale_key, values in GRADING_SCALES.items():
         if scale_key in scale_lower or scale_lower in scale_key:
-            return (gpa / values["max"]) * 100
+            return gpa * _GPA_MULTIPLIERS[scale_key]
     
     # Default to 4.0 scale
-    return (gpa / 4.0) * 100
+    return gpa * 25.0
 
 
-def infer_skills_from_major(major: str) -> list[str]:
+def infer_skills_from_major(major: str) -> tuple[str, ...]:
     """
     Infer likely technical skills from academic major.
     
@@ -161,46 +286,57 @@ def infer_skills_from_major(major: str) -> list[str]:
         major: Academic major name
         
     Returns:
-        List of inferred skills
+        Tuple of inferred skills (shared, read-only)
     """
     if not major:
-        return []
+        return ()
     
     major_lower = major.lower().strip()
     
-    for key, skills in MAJOR_TO_SKILLS_MAP.items():
+    # Exact match first (keys are already lowercase), then substring match
+    skills = MAJOR_TO_SKILLS_MAP.get(major_lower)
+    if skills is not None:
+        return skills
+    
+    return _match_major_substring(major_lower)
+
+
+@lru_cache(maxsize=1024)
+def _match_major_substring(major_lower: str) -> tuple[str, ...]:
+    """First map entry whose key contains, or is contained in, the major (memoized)."""
+    for key, skills in _MAJOR_SKILL_ITEMS:
         if key in major_lower or major_lower in key:
             return skills
     
-    return []
+    return ()
 
 
 # Persona classification rules
 PERSONA_RULES = {
     "high_potential_low_resource": {
-        "conditions": ["high_academic", "low_budget"],
+        "conditions": ("high_academic", "low_budget"),
         "label": "High-Potential, Low-Resource Student",
-        "traits": ["Academically strong", "Budget-conscious", "Scholarship candidate"],
+        "traits": ("Academically strong", "Budget-conscious", "Scholarship candidate"),
     },
     "career_switcher": {
-        "conditions": ["has_experience", "different_field"],
+        "conditions": ("has_experience", "different_field"),
         "label": "Career Switcher",
-        "traits": ["Transferable skills", "Industry experience", "Clear motivation"],
+        "traits": ("Transferable skills", "Industry experience", "Clear motivation"),
     },
     "fast_tracker": {
-        "conditions": ["high_academic", "high_ambition", "high_risk_tolerance"],
+        "conditions": ("high_academic", "high_ambition", "high_risk_tolerance"),
         "label": "Fast-Track Ambitious",
-        "traits": ["High achiever", "Risk-taker", "Growth-oriented"],
+        "traits": ("High achiever", "Risk-taker", "Growth-oriented"),
     },
     "steady_climber": {
-        "conditions": ["moderate_academic", "low_risk_tolerance", "structured_preference"],
+        "conditions": ("moderate_academic", "low_risk_tolerance", "structured_preference"),
         "label": "Steady Climber",
-        "traits": ["Methodical", "Risk-averse", "Stability-focused"],
+        "traits": ("Methodical", "Risk-averse", "Stability-focused"),
     },
     "explorer": {
-        "conditions": ["multiple_interests", "undecided_field"],
+        "conditions": ("multiple_interests", "undecided_field"),
         "label": "Career Explorer",
-        "traits": ["Curious", "Versatile", "Discovery-oriented"],
+        "traits": ("Curious", "Versatile", "Discovery-oriented"),
     },
 }
 
@@ -210,18 +346,13 @@ def calculate_age(date_of_birth) -> Optional[int]:
     if not date_of_birth:
         return None
     
-    from datetime import datetime
-    
     if isinstance(date_of_birth, str):
         try:
-            date_of_birth = datetime.fromisoformat(date_of_birth.replace('Z', '+00:00'))
+            # Python 3.11+ parses a trailing "Z" natively
+            date_of_birth = datetime.fromisoformat(date_of_birth)
         except ValueError:
             return None
     
-    today = datetime.now()
-    age = today.year - date_of_birth.year
-    
-    if (today.month, today.day) < (date_of_birth.month, date_of_birth.day):
-        age -= 1
-    
-    return age
+    today = date.today()
+    # Subtract one if this year's birthday hasn't happened yet
+    return today.year - date_of_birth.year - ((today.month, today.day) < (date_of_birth.month, date_of_birth.day))
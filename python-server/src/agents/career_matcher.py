@@ -3,12 +3,19 @@ Node A2: CareerMatcher Agent
 The Career Fit Analyzer - Identifies top 3 career matches with detailed reasoning
 """
 
+import os
 import time
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from typing import Optional
+import orjson
 from pydantic import BaseModel, Field
-from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.messages import SystemMessage
+from langchain_core.prompts import ChatPromptTemplate, HumanMessagePromptTemplate
 
-from .base import get_llm
+from .base import get_llm, DEFAULT_AGENT_CONFIG
 from ..models.state import CareerSimulationState
 from ..models.career_profile import CareerProfile, NormalizedProfile
 
@@ -92,57 +99,90 @@ class CareerMatcherOutput(BaseModel):
     )
 
 
-# ============ Main Agent Function ============
+# ============ Fallback Templates ============
+
+# Default career suggestions based on common CS profiles: (title, field, tagline)
+_FALLBACK_CAREERS = (
+    ("Software Engineer", "Technology", "Build the digital products that shape how the world works and connects"),
+    ("Data Scientist", "AI/ML", "Turn raw data into insights that drive billion-dollar business decisions"),
+    ("Product Manager", "Technology", "Lead product strategy at the intersection of technology and business"),
+)
+
+_FALLBACK_REASONING = CareerFitReasoning(
+    strengths_alignment=[
+        "Strong analytical and problem-solving abilities",
+        "Technical aptitude demonstrated through coursework",
+        "Ability to learn new technologies quickly",
+        "Good foundation in computer science fundamentals",
+    ],
+    interest_match=[
+        "Expressed interest aligns with daily responsibilities",
+        "Work involves continuous learning and growth",
+    ],
+    skill_transferability=[
+        "Programming skills directly applicable",
+        "Analytical thinking transfers well",
+        "Communication skills valuable for team collaboration",
+    ],
+    growth_potential_reasons=[
+        "Industry growing at 15-20% annually",
+        "Clear career progression paths exist",
+        "High demand for skilled professionals",
+    ],
+    market_demand_reasons=[
+        "Strong job market with many openings",
+        "Competitive salaries above average",
+        "Remote work opportunities abundant",
+    ],
+    potential_challenges=[
+        "Competitive entry-level market",
+        "Continuous learning required to stay current",
+        "May require building portfolio projects",
+    ],
+    why_now="The tech industry continues to grow despite economic uncertainty, making now a good time to build foundational skills.",
+)
+
+# Built once at import; _create_fallback_career_fits only overrides title/field
+_FALLBACK_FIT_TEMPLATES = tuple(
+    CareerFitOutput(
+        rank=i + 1,
+        career_title=title,
+        career_field=field,
+        overall_fit_score=90 - (i * 8),
+        skill_fit_score=85 - (i * 5),
+        interest_fit_score=88 - (i * 6),
+        market_fit_score=85 - (i * 4),
+        personality_fit_score=82 - (i * 5),
+        tagline=tagline,
+        reasoning=_FALLBACK_REASONING,
+        typical_salary_range="$70,000 - $120,000",
+        time_to_entry="6-12 months",
+        difficulty_level="Moderate" if i < 2 else "Challenging",
+        top_3_reasons=[
+            "Strong alignment with your technical background",
+            "Excellent market demand and salary potential",
+            "Clear path from current position",
+        ],
+        key_skills_needed=[
+            "Programming (Python, JavaScript)",
+            "Data Structures & Algorithms",
+            "System Design basics",
+            "Communication & Teamwork",
+            "Problem Solving",
+        ],
+        immediate_next_steps=[
+            "Complete a foundational online course",
+            "Build 2-3 portfolio projects",
+            "Start applying to internships/entry-level positions",
+        ],
+    )
+    for i, (title, field, tagline) in enumerate(_FALLBACK_CAREERS)
+)
 
-def career_matcher_node(state: CareerSimulationState) -> dict:
-    """
-    Node A2: CareerMatcher
-    Analyzes user profile and returns top 3 career fits with detailed reasoning.
-    
-    This is the FIRST stage of the two-stage process.
-    The graph PAUSES after this node until user selects a career.
-    
-    Args:
-        state: Current graph state with normalized profile
-        
-    Returns:
-        State update with career_fits list
-    """
-    start_time = time.time()
-    
-    profile = state.get("career_profile")
-    normalized = state.get("normalized_profile")
-    
-    if not profile:
-        return {
-            "errors": ["No career profile provided"],
-            "current_node": "career_matcher",
-        }
-    
-    # Get structured output from LLM
-    try:
-        result = _analyze_career_fits(profile, normalized)
-    except Exception as e:
-        print(f"Career matcher LLM failed: {e}")
-        result = _create_fallback_career_fits(profile, normalized)
-    
-    processing_time = (time.time() - start_time) * 1000
-    
-    return {
-        "career_fits": result,
-        "current_node": "career_matcher",
-        "processing_time_ms": {"career_matcher": processing_time},
-    }
 
+# ============ Prompt ============
 
-def _analyze_career_fits(
-    profile: CareerProfile,
-    normalized: Optional[NormalizedProfile]
-) -> CareerMatcherOutput:
-    """Use LLM with structured output to analyze career fits."""
-    
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", """You are an expert career counselor with deep knowledge of:
+_SYSTEM_PROMPT = """You are an expert career counselor with deep knowledge of:
 - Current job market trends and salary data (2024-2025)
 - Skill requirements for various tech and non-tech roles
 - Career progression paths across industries
@@ -178,9 +218,9 @@ REASONING REQUIREMENTS:
 - Be specific to this user's profile, not generic advice
 - Include both optimistic and realistic perspectives
 - If resume is provided, cite specific experiences/skills from it
-- Match reasoning to what the user has actually done (from resume) + what they want (from profile)"""),
-        
-        ("human", """Analyze this profile and recommend the TOP 3 best-fit careers:
+- Match reasoning to what the user has actually done (from resume) + what they want (from profile)"""
+
+_HUMAN_PROMPT = """Analyze this profile and recommend the TOP 3 best-fit careers:
 
 === BASIC INFO ===
 Education Level: {education_level}
@@ -223,14 +263,175 @@ Optimism Level: {optimism_level}
 Based on this comprehensive profile{resume_note}, provide exactly 3 career recommendations ranked by overall fit.
 Make sure each career is DIFFERENT (not just variations like "Data Scientist" and "Senior Data Scientist").
 Provide detailed reasoning for why each career is a good fit for THIS specific person.
-{resume_instruction}""")
-    ])
+{resume_instruction}"""
+
+# The system prompt has no variables, so it is a ready-made message that is
+# passed through as-is instead of being re-formatted on every call
+CAREER_MATCHER_PROMPT = ChatPromptTemplate.from_messages([
+    SystemMessage(content=_SYSTEM_PROMPT),
+    HumanMessagePromptTemplate.from_template(_HUMAN_PROMPT),
+])
+
+
+CAREER_MATCHER_TEMPERATURE = 0.4
+
+# In-process cache of LLM responses keyed by a hash of the prompt inputs
+RESPONSE_CACHE_ENABLED = os.getenv("CACHE_ENABLED", "false").lower() == "true"
+RESPONSE_CACHE_SIZE = 512
+_response_cache: OrderedDict[str, str] = OrderedDict()
+_response_cache_lock = threading.Lock()
+
+
+@lru_cache(maxsize=8)
+def _get_chain(temperature: float):
+    """Build the prompt -> structured-output chain once per temperature."""
+    structured_llm = get_llm(temperature=temperature).with_structured_output(CareerMatcherOutput)
+    # Bounded retry with exponential backoff before falling back to templates;
+    # ainvoke backs off with asyncio.sleep, so the event loop is never blocked
+    return (CAREER_MATCHER_PROMPT | structured_llm).with_retry(
+        stop_after_attempt=DEFAULT_AGENT_CONFIG.max_retries,
+        exponential_jitter_params={"initial": DEFAULT_AGENT_CONFIG.retry_delay},
+    )
+
+
+def warm_career_matcher() -> None:
+    """
+    Build the CareerMatcher chain ahead of the first request.
+    
+    with_structured_output converts the nested CareerMatcherOutput models
+    into a tool schema when the chain is built; doing it at startup keeps
+    that (and client construction) off the first /analyze call.
+    """
+    _get_chain(CAREER_MATCHER_TEMPERATURE)
+
+
+# ============ Main Agent Function ============
+
+def career_matcher_node(state: CareerSimulationState) -> dict:
+    """
+    Node A2: CareerMatcher
+    Analyzes user profile and returns top 3 career fits with detailed reasoning.
+    
+    This is the FIRST stage of the two-stage process.
+    The graph PAUSES after this node until user selects a career.
+    
+    Args:
+        state: Current graph state with normalized profile
+        
+    Returns:
+        State update with career_fits list
+    """
+    start_ns = time.perf_counter_ns()
+    
+    profile = state.get("career_profile")
+    normalized = state.get("normalized_profile")
+    
+    if not profile:
+        return _missing_profile_update()
+    
+    # Get structured output from LLM
+    try:
+        result = _analyze_career_fits(profile, normalized)
+    except Exception as e:
+        print(f"Career matcher LLM failed: {e}")
+        result = _create_fallback_career_fits(profile, normalized)
+    
+    return _career_fits_update(result, start_ns)
+
+
+async def career_matcher_node_async(state: CareerSimulationState) -> dict:
+    """
+    Async variant of career_matcher_node used by ainvoke/astream.
+    
+    Awaits the LLM call on the event loop instead of parking a worker
+    thread for the whole completion.
+    
+    Args:
+        state: Current graph state with normalized profile
+        
+    Returns:
+        State update with career_fits list
+    """
+    start_ns = time.perf_counter_ns()
+    
+    profile = state.get("career_profile")
+    normalized = state.get("normalized_profile")
+    
+    if not profile:
+        return _missing_profile_update()
+    
+    try:
+        result = await _analyze_career_fits_async(profile, normalized)
+    except Exception as e:
+        print(f"Career matcher LLM failed: {e}")
+        result = _create_fallback_career_fits(profile, normalized)
+    
+    return _career_fits_update(result, start_ns)
+
+
+def _missing_profile_update() -> dict:
+    """State update for a graph run without a career profile."""
+    return {
+        "errors": ["No career profile provided"],
+        "current_node": "career_matcher",
+    }
+
+
+def _career_fits_update(result: CareerMatcherOutput, start_ns: int) -> dict:
+    """State update carrying the matcher output and its timing."""
+    # Monotonic clock, so NTP adjustments can't skew the reported duration
+    processing_time = (time.perf_counter_ns() - start_ns) / 1_000_000
+    
+    return {
+        "career_fits": result,
+        "current_node": "career_matcher",
+        "processing_time_ms": {"career_matcher": processing_time},
+    }
+
+
+def _csv(items: Optional[list[str]], empty: str = "Not specified") -> str:
+    """Comma-join a profile list field, or return a placeholder when it is empty."""
+    return ", ".join(items) if items else empty
+
+
+def _json(obj: Optional[dict], empty: str = "Not specified") -> str:
+    """Compact JSON for a profile dict field, or a placeholder when it is empty."""
+    return orjson.dumps(obj).decode() if obj else empty
+
+
+# Prompt variables copied straight from the profile:
+# (prompt variable, CareerProfile field, placeholder when unset)
+_SCALAR_PROMPT_FIELDS = (
+    ("education_level", "current_education_level", "Not specified"),
+    ("institution", "institution_name", "Not specified"),
+    ("major", "current_major", "Not specified"),
+    ("gpa", "current_gpa", "N/A"),
+    ("gpa_scale", "grading_scale", "N/A"),
+    ("graduation_year", "expected_graduation_year", "Not specified"),
+    ("country", "current_country", "Not specified"),
+    ("career_goal", "primary_career_goal", "Not specified"),
+    ("role_level", "desired_role_level", "Not specified"),
+    ("work_style", "work_style", "Not specified"),
+    ("risk_tolerance", "risk_tolerance", "Medium"),
+    ("investment_capacity", "investment_capacity", "Not specified"),
+    ("hours_per_week", "hours_per_week", 20),
+    ("workforce_timeline", "desired_workforce_timeline", "Not specified"),
+    ("market_awareness", "market_awareness", "Medium"),
+    ("optimism_level", "optimism_level", "Balanced"),
+)
+
+
+def _build_prompt_inputs(
+    profile: CareerProfile,
+    normalized: Optional[NormalizedProfile]
+) -> dict:
+    """Format the profile into the CareerMatcher prompt variables."""
     
     # Format profile data
     normalized_summary = ""
     if normalized:
         # Build persona traits string safely
-        persona_traits = ', '.join(normalized.persona_traits) if normalized.persona_traits else 'Not analyzed'
+        persona_traits = _csv(normalized.persona_traits, "Not analyzed")
         
         normalized_summary = f"""
 === AI ANALYSIS OF PROFILE ===
@@ -240,24 +441,19 @@ Academic Strength Score: {normalized.academic_strength_score}/100
 Career Readiness Score: {normalized.career_readiness_score}/100
 Skill Readiness Score: {normalized.skill_readiness_score}/100
 Financial Readiness Score: {normalized.financial_readiness_score}/100
-Combined Technical Skills: {normalized.combined_technical_skills}
-Inferred Technical Skills: {normalized.inferred_technical_skills}
+Combined Technical Skills: {_json(normalized.combined_technical_skills, "{}")}
+Inferred Technical Skills: {_json(normalized.inferred_technical_skills, "{}")}
 
 Profile Summary: {normalized.profile_summary}
 """
     
-    llm = get_llm(temperature=0.4)
-    structured_llm = llm.with_structured_output(CareerMatcherOutput)
-    
-    chain = prompt | structured_llm
-    
     # Build resume section if available
     resume_section = ""
     resume_note = ""
     resume_instruction = ""
     if profile.resume_text:
         # Truncate resume to avoid token limits (keep ~4000 chars)
-        resume_text = profile.resume_text[:4000] if len(profile.resume_text) > 4000 else profile.resume_text
+        resume_text = profile.resume_text[:4000]
         resume_section = f"""
 === RESUME / CV CONTENT ===
 (Extracted from uploaded resume: {profile.resume_filename or 'resume.pdf'})
@@ -273,36 +469,90 @@ IMPORTANT: Use specific information from the resume to:
 4. Consider career trajectory patterns from work history
 """
     
-    result = chain.invoke({
-        "education_level": profile.current_education_level or "Not specified",
-        "institution": profile.institution_name or "Not specified",
-        "major": profile.current_major or "Not specified",
-        "gpa": profile.current_gpa or "N/A",
-        "gpa_scale": profile.grading_scale or "N/A",
-        "graduation_year": profile.expected_graduation_year or "Not specified",
-        "country": profile.current_country or "Not specified",
-        "target_fields": ", ".join(profile.target_career_fields) if profile.target_career_fields else "Not specified",
-        "specific_roles": ", ".join(profile.specific_roles) if profile.specific_roles else "Not specified",
-        "career_goal": profile.primary_career_goal or "Not specified",
-        "role_level": profile.desired_role_level or "Not specified",
-        "work_env": ", ".join(profile.preferred_work_env) if profile.preferred_work_env else "Not specified",
-        "technical_skills": str(profile.technical_skills) if profile.technical_skills else "Not specified",
-        "soft_skills": str(profile.soft_skills) if profile.soft_skills else "Not specified",
-        "work_style": profile.work_style or "Not specified",
-        "risk_tolerance": profile.risk_tolerance or "Medium",
-        "learning_style": ", ".join(profile.learning_style) if profile.learning_style else "Not specified",
-        "investment_capacity": profile.investment_capacity or "Not specified",
-        "hours_per_week": profile.hours_per_week or 20,
-        "workforce_timeline": profile.desired_workforce_timeline or "Not specified",
-        "market_awareness": profile.market_awareness or "Medium",
-        "career_concerns": ", ".join(profile.career_concerns) if profile.career_concerns else "None specified",
-        "optimism_level": profile.optimism_level or "Balanced",
-        "normalized_summary": normalized_summary,
-        "resume_section": resume_section,
-        "resume_note": resume_note,
-        "resume_instruction": resume_instruction,
-    })
+    inputs = {
+        var: getattr(profile, field) or empty
+        for var, field, empty in _SCALAR_PROMPT_FIELDS
+    }
+    inputs.update(
+        target_fields=_csv(profile.target_career_fields),
+        specific_roles=_csv(profile.specific_roles),
+        work_env=_csv(profile.preferred_work_env),
+        learning_style=_csv(profile.learning_style),
+        career_concerns=_csv(profile.career_concerns, "None specified"),
+        technical_skills=_json(profile.technical_skills),
+        soft_skills=_json(profile.soft_skills),
+        normalized_summary=normalized_summary,
+        resume_section=resume_section,
+        resume_note=resume_note,
+        resume_instruction=resume_instruction,
+    )
+    return inputs
+
+
+def _response_cache_key(inputs: dict) -> str:
+    """Hash the prompt inputs into a response cache key."""
+    return hashlib.blake2b(
+        orjson.dumps(inputs, option=orjson.OPT_SORT_KEYS), digest_size=16
+    ).hexdigest()
+
+
+def _get_cached_response(cache_key: str) -> Optional[CareerMatcherOutput]:
+    """Return the cached structured response for identical prompt inputs."""
+    with _response_cache_lock:
+        cached = _response_cache.get(cache_key)
+        if cached is not None:
+            _response_cache.move_to_end(cache_key)
+    if cached is None:
+        return None
+    return CareerMatcherOutput.model_validate_json(cached)
+
+
+def _cache_response(cache_key: str, result: CareerMatcherOutput) -> None:
+    """Store a structured response, evicting the least recently used entry."""
+    with _response_cache_lock:
+        _response_cache[cache_key] = result.model_dump_json()
+        while len(_response_cache) > RESPONSE_CACHE_SIZE:
+            _response_cache.popitem(last=False)
+
+
+def _analyze_career_fits(
+    profile: CareerProfile,
+    normalized: Optional[NormalizedProfile]
+) -> CareerMatcherOutput:
+    """Use LLM with structured output to analyze career fits."""
+    inputs = _build_prompt_inputs(profile, normalized)
     
+    if not RESPONSE_CACHE_ENABLED:
+        return _get_chain(CAREER_MATCHER_TEMPERATURE).invoke(inputs)
+    
+    # Identical prompt inputs reuse the previous structured response
+    cache_key = _response_cache_key(inputs)
+    cached = _get_cached_response(cache_key)
+    if cached is not None:
+        return cached
+    
+    result = _get_chain(CAREER_MATCHER_TEMPERATURE).invoke(inputs)
+    _cache_response(cache_key, result)
+    return result
+
+
+async def _analyze_career_fits_async(
+    profile: CareerProfile,
+    normalized: Optional[NormalizedProfile]
+) -> CareerMatcherOutput:
+    """Async variant of _analyze_career_fits using chain.ainvoke."""
+    inputs = _build_prompt_inputs(profile, normalized)
+    
+    if not RESPONSE_CACHE_ENABLED:
+        return await _get_chain(CAREER_MATCHER_TEMPERATURE).ainvoke(inputs)
+    
+    cache_key = _response_cache_key(inputs)
+    cached = _get_cached_response(cache_key)
+    if cached is not None:
+        return cached
+    
+    result = await _get_chain(CAREER_MATCHER_TEMPERATURE).ainvoke(inputs)
+    _cache_response(cache_key, result)
     return result
 
 
@@ -316,103 +566,15 @@ def _create_fallback_career_fits(
     target_roles = profile.specific_roles or []
     target_fields = profile.target_career_fields or []
     
-    # Default career suggestions based on common CS profiles
-    default_careers = [
-        {
-            "title": "Software Engineer",
-            "field": "Technology",
-            "tagline": "Build the digital products that shape how the world works and connects",
-        },
-        {
-            "title": "Data Scientist", 
-            "field": "AI/ML",
-            "tagline": "Turn raw data into insights that drive billion-dollar business decisions",
-        },
-        {
-            "title": "Product Manager",
-            "field": "Technology",
-            "tagline": "Lead product strategy at the intersection of technology and business",
-        },
-    ]
-    
-    # Try to use user's preferences if available
-    if target_roles:
-        default_careers[0]["title"] = target_roles[0]
-        if len(target_roles) > 1:
-            default_careers[1]["title"] = target_roles[1]
-    
-    if target_fields:
-        default_careers[0]["field"] = target_fields[0]
-        if len(target_fields) > 1:
-            default_careers[1]["field"] = target_fields[1] if len(target_fields) > 1 else target_fields[0]
-    
+    # Only the first two fits take the user's preferred roles/fields
     career_fits = []
-    for i, career in enumerate(default_careers):
-        fit = CareerFitOutput(
-            rank=i + 1,
-            career_title=career["title"],
-            career_field=career["field"],
-            overall_fit_score=90 - (i * 8),
-            skill_fit_score=85 - (i * 5),
-            interest_fit_score=88 - (i * 6),
-            market_fit_score=85 - (i * 4),
-            personality_fit_score=82 - (i * 5),
-            tagline=career["tagline"],
-            reasoning=CareerFitReasoning(
-                strengths_alignment=[
-                    "Strong analytical and problem-solving abilities",
-                    "Technical aptitude demonstrated through coursework",
-                    "Ability to learn new technologies quickly",
-                    "Good foundation in computer science fundamentals",
-                ],
-                interest_match=[
-                    "Expressed interest aligns with daily responsibilities",
-                    "Work involves continuous learning and growth",
-                ],
-                skill_transferability=[
-                    "Programming skills directly applicable",
-                    "Analytical thinking transfers well",
-                    "Communication skills valuable for team collaboration",
-                ],
-                growth_potential_reasons=[
-                    "Industry growing at 15-20% annually",
-                    "Clear career progression paths exist",
-                    "High demand for skilled professionals",
-                ],
-                market_demand_reasons=[
-                    "Strong job market with many openings",
-                    "Competitive salaries above average",
-                    "Remote work opportunities abundant",
-                ],
-                potential_challenges=[
-                    "Competitive entry-level market",
-                    "Continuous learning required to stay current",
-                    "May require building portfolio projects",
-                ],
-                why_now="The tech industry continues to grow despite economic uncertainty, making now a good time to build foundational skills.",
-            ),
-            typical_salary_range="$70,000 - $120,000",
-            time_to_entry="6-12 months",
-            difficulty_level="Moderate" if i < 2 else "Challenging",
-            top_3_reasons=[
-                "Strong alignment with your technical background",
-                "Excellent market demand and salary potential",
-                "Clear path from current position",
-            ],
-            key_skills_needed=[
-                "Programming (Python, JavaScript)",
-                "Data Structures & Algorithms",
-                "System Design basics",
-                "Communication & Teamwork",
-                "Problem Solving",
-            ],
-            immediate_next_steps=[
-                "Complete a foundational online course",
-                "Build 2-3 portfolio projects",
-                "Start applying to internships/entry-level positions",
-            ],
-        )
-        career_fits.append(fit)
+    for i, template in enumerate(_FALLBACK_FIT_TEMPLATES):
+        update = {}
+        if i < 2 and len(target_roles) > i:
+            update["career_title"] = target_roles[i]
+        if i < 2 and len(target_fields) > i:
+            update["career_field"] = target_fields[i]
+        career_fits.append(template.model_copy(update=update))
     
     return CareerMatcherOutput(
         analysis_summary=f"Based on your profile as a {profile.current_education_level or 'student'} in {profile.current_major or 'Computer Science'}, you have strong potential in technical roles with good market demand.",
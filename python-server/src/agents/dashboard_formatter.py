@@ -3,14 +3,57 @@ Node G: DashboardFormatter Agent
 The UI Mapper - Converts simulation data to frontend-ready format with rich visualizations
 """
 
+import re
 import time
-import uuid
+import itertools
+from collections import defaultdict
+from typing import Callable, Optional
 from ..models.state import (
     CareerSimulationState,
+    CareerFit,
+    CareerPath,
     DashboardData,
     DashboardMilestone,
+    FinancialAnalysis,
+    GapAnalysis,
+    RiskAssessment,
     SkillNode,
+    TimelineSimulation,
 )
+from ..models.career_profile import CareerProfile, NormalizedProfile
+
+
+# Digit runs in a salary range string once thousands separators are removed
+_SALARY_RE = re.compile(r"\d+")
+
+# Display formatters for dashboard cards
+_money = "${:,.0f}".format
+_pct = "{:.0f}%".format
+
+_CHART_COLORS = ("#8884d8", "#82ca9d", "#ffc658", "#ff7300", "#00C49F", "#FFBB28")
+
+# Skill level labels -> skill tree level (0-5) and radar chart percentage.
+# LLM output is usually title-cased ("Intermediate"), so that form is indexed
+# too and only unusual casings pay for a lower() call.
+_SKILL_LEVELS = {
+    "none": 0, "basic": 1, "beginner": 1,
+    "intermediate": 2, "advanced": 3, "expert": 4, "master": 5,
+}
+_SKILL_LEVEL_PCT = {
+    "none": 0, "basic": 25, "beginner": 25,
+    "intermediate": 50, "advanced": 75, "expert": 100,
+}
+for _levels in (_SKILL_LEVELS, _SKILL_LEVEL_PCT):
+    _levels.update({label.title(): value for label, value in list(_levels.items())})
+
+
+def _quarter_offset(quarter: int) -> tuple[int, int]:
+    """React Flow (x offset within the year column, y) for a quarterly milestone."""
+    return quarter * 80, 100 + (quarter - 1) * 60
+
+
+# Precomputed for Q1-Q4; any other quarter the LLM emits falls back to the formula
+_QUARTER_OFFSETS = {quarter: _quarter_offset(quarter) for quarter in range(1, 5)}
 
 
 def dashboard_formatter_node(state: CareerSimulationState) -> dict:
@@ -27,53 +70,69 @@ def dashboard_formatter_node(state: CareerSimulationState) -> dict:
     """
     start_time = time.time()
     
+    # Each builder takes the sections it reads instead of re-fetching them from state
+    timeline = state.get("timeline_simulation")
+    financial = state.get("financial_analysis")
+    gap = state.get("gap_analysis")
+    risk = state.get("risk_assessment")
+    normalized = state.get("normalized_profile")
+    selected = state.get("selected_career")
+    # Most builders only read the realistic path
+    realistic = timeline.realistic_path if timeline else None
+    
     dashboard = DashboardData()
     
-    # Format milestones for roadmap visualization
-    dashboard.milestones, dashboard.milestone_connections = _format_milestones(state)
+    # Single-section builders only run when their section exists; otherwise the
+    # dashboard keeps its empty defaults
+    if timeline:
+        # Format milestones for roadmap visualization
+        dashboard.milestones, dashboard.milestone_connections = _format_milestones(timeline)
+        dashboard.salary_progression = _generate_salary_progression_chart(timeline)
+        dashboard.path_comparison = _generate_path_comparison_chart(timeline)
     
-    # Format skill tree
-    dashboard.skill_nodes = _format_skill_tree(state)
+    if realistic:
+        dashboard.timeline_progress = _generate_timeline_progress_chart(realistic)
+        dashboard.timeline_events = _generate_timeline_events(realistic)
     
-    # Generate all chart data
-    dashboard.salary_progression = _generate_salary_progression_chart(state)
-    dashboard.cost_vs_income = _generate_cost_income_chart(state)
-    dashboard.skill_radar = _generate_skill_radar_chart(state)
-    dashboard.risk_breakdown = _generate_risk_breakdown_chart(state)
-    dashboard.gap_analysis_chart = _generate_gap_analysis_chart(state)
-    dashboard.investment_breakdown = _generate_investment_breakdown_chart(state)
-    dashboard.timeline_progress = _generate_timeline_progress_chart(state)
-    dashboard.monthly_projection = _generate_monthly_projection_chart(state)
-    dashboard.path_comparison = _generate_path_comparison_chart(state)
+    if financial:
+        (
+            dashboard.cost_vs_income,
+            dashboard.investment_breakdown,
+            dashboard.monthly_projection,
+        ) = _walk_financials(financial)
     
-    # Success probability gauge
-    risk_assessment = state.get("risk_assessment")
-    if risk_assessment:
-        dashboard.success_probability_gauge = risk_assessment.success_probability_score
+    if gap:
+        # Format skill tree
+        dashboard.skill_nodes = _format_skill_tree(gap)
+        dashboard.skill_radar = _generate_skill_radar_chart(gap)
+        dashboard.gap_analysis_chart = _generate_gap_analysis_chart(gap)
     
-    # Summary statistics
-    dashboard.summary_stats = _generate_summary_stats(state)
-    dashboard.key_metrics = _generate_key_metrics(state)
+    if risk:
+        # Success probability gauge
+        dashboard.success_probability_gauge = risk.success_probability_score
+        dashboard.risk_breakdown = _generate_risk_breakdown_chart(risk)
+        dashboard.risk_indicators = _generate_risk_indicators(risk)
     
-    # Timeline events
-    dashboard.timeline_events = _generate_timeline_events(state)
+    if selected:
+        # Selected career summary for context
+        dashboard.selected_career_summary = _generate_selected_career_summary(selected)
+    
+    # Summary statistics
+    dashboard.summary_stats = _generate_summary_stats(risk, financial, gap, realistic, normalized)
+    dashboard.key_metrics = _generate_key_metrics(risk, financial, timeline, dashboard.summary_stats)
     
     # Key insights with reasoning
-    dashboard.key_insights = _generate_key_insights(state)
-    dashboard.decision_rationale = _generate_decision_rationale(state)
+    dashboard.key_insights = _generate_key_insights(gap, risk, financial)
+    dashboard.decision_rationale = _generate_decision_rationale(timeline, selected)
     
     # Recommendations
-    dashboard.top_recommendations = _generate_top_recommendations(state)
-    dashboard.immediate_actions = _generate_immediate_actions(state)
-    
-    # Risk indicators
-    dashboard.risk_indicators = _generate_risk_indicators(state)
-    
-    # Selected career summary for context
-    dashboard.selected_career_summary = _generate_selected_career_summary(state)
+    dashboard.top_recommendations = _generate_top_recommendations(risk, gap)
+    dashboard.immediate_actions = _generate_immediate_actions(gap, realistic)
     
     # Generate final report summary
-    final_summary = _generate_final_summary(state)
+    final_summary = _generate_final_summary(
+        state["career_profile"], normalized, timeline, risk, financial, selected
+    )
     
     processing_time = (time.time() - start_time) * 1000
     
@@ -86,34 +145,42 @@ def dashboard_formatter_node(state: CareerSimulationState) -> dict:
     }
 
 
-def _format_milestones(state: CareerSimulationState) -> tuple[list[DashboardMilestone], list[dict]]:
+def _paths_by_name(timeline: TimelineSimulation) -> dict[str, Optional[CareerPath]]:
+    """The three simulated paths keyed by their recommended_path name."""
+    return {
+        "conservative": timeline.conservative_path,
+        "realistic": timeline.realistic_path,
+        "ambitious": timeline.ambitious_path,
+    }
+
+
+def _format_milestones(timeline: Optional[TimelineSimulation]) -> tuple[list[DashboardMilestone], list[dict]]:
     """Format timeline milestones for React Flow visualization."""
     milestones = []
     connections = []
     
-    timeline = state.get("timeline_simulation")
     if not timeline:
         return milestones, connections
     
-    # Get the recommended path
-    path = timeline.realistic_path
-    if timeline.recommended_path == "conservative" and timeline.conservative_path:
-        path = timeline.conservative_path
-    elif timeline.recommended_path == "ambitious" and timeline.ambitious_path:
-        path = timeline.ambitious_path
+    # Get the recommended path, falling back to the realistic one
+    path = _paths_by_name(timeline).get(timeline.recommended_path) or timeline.realistic_path
     
     if not path:
         return milestones, connections
     
     prev_milestone_id = None
-    y_offset = 0
+    # IDs only need to be unique within this payload
+    milestone_seq = itertools.count()
+    # Bound appends keep attribute lookups out of the nested loop
+    add_milestone = milestones.append
+    add_connection = connections.append
     
     for year in path.yearly_plans:
         year_x_base = (year.year_number - 1) * 400
         
         # Add year header milestone
         year_id = f"year_{year.year_number}"
-        milestones.append(DashboardMilestone(
+        add_milestone(DashboardMilestone(
             id=year_id,
             title=year.year_label,
             description=year.primary_focus,
@@ -125,7 +192,7 @@ def _format_milestones(state: CareerSimulationState) -> tuple[list[DashboardMile
         ))
         
         if prev_milestone_id:
-            connections.append({
+            add_connection({
                 "id": f"conn_{prev_milestone_id}_{year_id}",
                 "source": prev_milestone_id,
                 "target": year_id,
@@ -133,11 +200,11 @@ def _format_milestones(state: CareerSimulationState) -> tuple[list[DashboardMile
         
         # Add quarterly milestones
         for milestone in year.milestones:
-            m_id = f"m_{year.year_number}_{milestone.quarter}_{uuid.uuid4().hex[:6]}"
-            x_pos = year_x_base + (milestone.quarter * 80)
-            y_pos = 100 + ((milestone.quarter - 1) * 60)
+            m_id = f"m_{year.year_number}_{milestone.quarter}_{next(milestone_seq)}"
+            x_offset, y_pos = _QUARTER_OFFSETS.get(milestone.quarter) or _quarter_offset(milestone.quarter)
+            x_pos = year_x_base + x_offset
             
-            milestones.append(DashboardMilestone(
+            add_milestone(DashboardMilestone(
                 id=m_id,
                 title=milestone.title,
                 description=milestone.description,
@@ -149,7 +216,7 @@ def _format_milestones(state: CareerSimulationState) -> tuple[list[DashboardMile
             ))
             
             # Connect to year header
-            connections.append({
+            add_connection({
                 "id": f"conn_{year_id}_{m_id}",
                 "source": year_id,
                 "target": m_id,
@@ -160,26 +227,25 @@ def _format_milestones(state: CareerSimulationState) -> tuple[list[DashboardMile
     return milestones, connections
 
 
-def _format_skill_tree(state: CareerSimulationState) -> list[SkillNode]:
+def _skill_level(levels: dict[str, int], label: str, default: int) -> int:
+    """Map a skill level label through a level table, lowercasing only on a miss."""
+    value = levels.get(label)
+    if value is None:
+        value = levels.get(label.lower(), default)
+    return value
+
+
+def _format_skill_tree(gap: Optional[GapAnalysis]) -> list[SkillNode]:
     """Format skill gaps into a skill tree structure."""
     nodes = []
     
-    gap = state.get("gap_analysis")
-    normalized = state.get("normalized_profile")
-    
     if not gap:
         return nodes
     
-    # Map skill levels to numbers
-    level_map = {
-        "none": 0, "basic": 1, "beginner": 1,
-        "intermediate": 2, "advanced": 3, "expert": 4, "master": 5,
-    }
-    
     # Add technical skill gaps as nodes
     for i, skill_gap in enumerate(gap.technical_skill_gaps):
-        current_level = level_map.get(skill_gap.current_level.lower(), 0)
-        required_level = level_map.get(skill_gap.required_level.lower(), 3)
+        current_level = _skill_level(_SKILL_LEVELS, skill_gap.current_level, 0)
+        required_level = _skill_level(_SKILL_LEVELS, skill_gap.required_level, 3)
         
         nodes.append(SkillNode(
             id=f"skill_{i}",
@@ -193,8 +259,8 @@ def _format_skill_tree(state: CareerSimulationState) -> list[SkillNode]:
     
     # Add soft skill gaps
     for i, skill_gap in enumerate(gap.soft_skill_gaps):
-        current_level = level_map.get(skill_gap.current_level.lower(), 0)
-        required_level = level_map.get(skill_gap.required_level.lower(), 3)
+        current_level = _skill_level(_SKILL_LEVELS, skill_gap.current_level, 0)
+        required_level = _skill_level(_SKILL_LEVELS, skill_gap.required_level, 3)
         
         nodes.append(SkillNode(
             id=f"soft_skill_{i}",
@@ -209,44 +275,33 @@ def _format_skill_tree(state: CareerSimulationState) -> list[SkillNode]:
     return nodes
 
 
-def _generate_salary_progression_chart(state: CareerSimulationState) -> list[dict]:
+def _generate_salary_progression_chart(timeline: Optional[TimelineSimulation]) -> list[dict]:
     """Generate salary progression data for multi-line chart comparing all paths."""
     data = []
     
-    timeline = state.get("timeline_simulation")
     if not timeline:
         return data
     
-    import re
-    
-    def extract_salary(salary_str: str, year: int) -> float:
-        """Extract average salary from range string."""
-        if not salary_str:
-            return 50000 + (year * 15000)
-        numbers = re.findall(r'[\d,]+', salary_str.replace(",", ""))
-        if numbers:
-            return sum(float(n.replace(",", "")) for n in numbers) / len(numbers)
-        return 50000 + (year * 15000)
-    
     # Get max years across all paths
     max_years = 5
-    paths = {
-        "conservative": timeline.conservative_path,
-        "realistic": timeline.realistic_path,
-        "ambitious": timeline.ambitious_path,
+    paths = _paths_by_name(timeline)
+    
+    # Index each path's plans by year once; reversed so the first plan for a
+    # year wins, as with a linear search
+    plans_by_year = {
+        path_name: {y.year_number: y for y in reversed(path.yearly_plans)}
+        if path and path.yearly_plans else None
+        for path_name, path in paths.items()
     }
     
     for year_num in range(1, max_years + 1):
         year_data = {"year": f"Year {year_num}"}
         
-        for path_name, path in paths.items():
-            if path and path.yearly_plans:
-                matching_year = next(
-                    (y for y in path.yearly_plans if y.year_number == year_num), 
-                    None
-                )
+        for path_name, year_plans in plans_by_year.items():
+            if year_plans is not None:
+                matching_year = year_plans.get(year_num)
                 if matching_year:
-                    year_data[path_name] = extract_salary(
+                    year_data[path_name] = _extract_salary(
                         matching_year.expected_salary_range, year_num
                     )
                 else:
@@ -259,16 +314,34 @@ def _generate_salary_progression_chart(state: CareerSimulationState) -> list[dic
     return data
 
 
-def _generate_cost_income_chart(state: CareerSimulationState) -> list[dict]:
-    """Generate cost vs income bar chart data."""
-    data = []
+def _extract_salary(salary_str: str, year: int) -> float:
+    """Extract average salary from range string."""
+    if not salary_str:
+        return 50000 + (year * 15000)
+    numbers = _SALARY_RE.findall(salary_str.replace(",", ""))
+    if numbers:
+        return sum(float(n) for n in numbers) / len(numbers)
+    return 50000 + (year * 15000)
+
+
+def _walk_financials(
+    financial: Optional[FinancialAnalysis],
+) -> tuple[list[dict], list[dict], list[dict]]:
+    """
+    Build the three financial charts in a single pass over yearly_financials.
     
-    financial = state.get("financial_analysis")
-    if not financial or not financial.yearly_financials:
-        return data
+    Returns:
+        (cost vs income bars, investment breakdown pie, monthly projection for first 2 years)
+    """
+    cost_income = []
+    monthly_projection = []
+    categories = defaultdict(float)
     
-    for year_fin in financial.yearly_financials:
-        data.append({
+    if not financial:
+        return cost_income, [], monthly_projection
+    
+    for i, year_fin in enumerate(financial.yearly_financials):
+        cost_income.append({
             "year": f"Year {year_fin.year_number}",
             "investment": year_fin.total_investment,
             "income": year_fin.expected_income,
@@ -276,28 +349,43 @@ def _generate_cost_income_chart(state: CareerSimulationState) -> list[dict]:
             "cumulative_investment": year_fin.cumulative_investment,
             "cumulative_income": year_fin.cumulative_income,
         })
+        
+        # Aggregate costs by category
+        for cost in year_fin.cost_breakdown:
+            categories[cost.category.title()] += cost.amount
+        
+        if i < 2:
+            # Every month of a year carries the same figures, so round them once
+            monthly_cost = year_fin.total_investment / 12
+            monthly_income = year_fin.expected_income / 12
+            cost = round(monthly_cost, 0)
+            income = round(monthly_income, 0)
+            net = round(monthly_income - monthly_cost, 0)
+            month_base = (year_fin.year_number - 1) * 12
+            
+            monthly_projection.extend(
+                {"month": f"M{month_base + month}", "cost": cost, "income": income, "net": net}
+                for month in range(1, 13)
+            )
     
-    return data
-
+    investment_breakdown = [
+        {"name": cat, "value": amount, "fill": _CHART_COLORS[i % len(_CHART_COLORS)]}
+        for i, (cat, amount) in enumerate(categories.items())
+    ]
+    
+    return cost_income, investment_breakdown, monthly_projection
 
-def _generate_skill_radar_chart(state: CareerSimulationState) -> list[dict]:
+def _generate_skill_radar_chart(gap: Optional[GapAnalysis]) -> list[dict]:
     """Generate skill radar chart data with current vs required levels."""
     data = []
     
-    gap = state.get("gap_analysis")
     if not gap:
         return data
     
-    # Map levels to percentages
-    level_to_pct = {
-        "none": 0, "basic": 25, "beginner": 25,
-        "intermediate": 50, "advanced": 75, "expert": 100,
-    }
-    
     # Add top 6 technical skills
     for skill_gap in gap.technical_skill_gaps[:6]:
-        current = level_to_pct.get(skill_gap.current_level.lower(), 0)
-        required = level_to_pct.get(skill_gap.required_level.lower(), 75)
+        current = _skill_level(_SKILL_LEVEL_PCT, skill_gap.current_level, 0)
+        required = _skill_level(_SKILL_LEVEL_PCT, skill_gap.required_level, 75)
         
         data.append({
             "skill": skill_gap.skill_name[:12],
@@ -309,9 +397,8 @@ def _generate_skill_radar_chart(state: CareerSimulationState) -> list[dict]:
     return data
 
 
-def _generate_risk_breakdown_chart(state: CareerSimulationState) -> list[dict]:
+def _generate_risk_breakdown_chart(risk: Optional[RiskAssessment]) -> list[dict]:
     """Generate risk breakdown pie chart data."""
-    risk = state.get("risk_assessment")
     if not risk:
         return []
     
@@ -323,11 +410,10 @@ def _generate_risk_breakdown_chart(state: CareerSimulationState) -> list[dict]:
     ]
 
 
-def _generate_gap_analysis_chart(state: CareerSimulationState) -> list[dict]:
+def _generate_gap_analysis_chart(gap: Optional[GapAnalysis]) -> list[dict]:
     """Generate gap analysis bar chart showing severity of each gap."""
     data = []
     
-    gap = state.get("gap_analysis")
     if not gap:
         return data
     
@@ -335,171 +421,106 @@ def _generate_gap_analysis_chart(state: CareerSimulationState) -> list[dict]:
         data.append({
             "skill": skill_gap.skill_name[:15],
             "gap": skill_gap.gap_severity,
-            "priority": skill_gap.priority if hasattr(skill_gap, 'priority') else "medium",
+            "priority": skill_gap.priority,
             "time": skill_gap.estimated_time_to_close,
         })
     
     return data
 
 
-def _generate_investment_breakdown_chart(state: CareerSimulationState) -> list[dict]:
-    """Generate investment breakdown pie chart."""
-    financial = state.get("financial_analysis")
-    if not financial:
+def _generate_timeline_progress_chart(realistic: Optional[CareerPath]) -> list[dict]:
+    """Generate timeline progress data for Gantt-style chart."""
+    if not realistic:
         return []
     
-    # Aggregate costs by category
-    categories = {}
-    for year_fin in financial.yearly_financials:
-        for cost in year_fin.cost_breakdown:
-            cat = cost.category.title()
-            categories[cat] = categories.get(cat, 0) + cost.amount
-    
-    colors = ["#8884d8", "#82ca9d", "#ffc658", "#ff7300", "#00C49F", "#FFBB28"]
     return [
-        {"name": cat, "value": amount, "fill": colors[i % len(colors)]}
-        for i, (cat, amount) in enumerate(categories.items())
+        {
+            "task": milestone.title[:30],
+            "year": year.year_number,
+            "quarter": milestone.quarter,
+            "type": milestone.type,
+            "duration": milestone.estimated_hours,
+            "cost": milestone.estimated_cost,
+        }
+        for year in realistic.yearly_plans
+        for milestone in year.milestones
     ]
 
 
-def _generate_timeline_progress_chart(state: CareerSimulationState) -> list[dict]:
-    """Generate timeline progress data for Gantt-style chart."""
-    data = []
-    
-    timeline = state.get("timeline_simulation")
-    if not timeline or not timeline.realistic_path:
-        return data
-    
-    path = timeline.realistic_path
-    
-    for year in path.yearly_plans:
-        for milestone in year.milestones:
-            data.append({
-                "task": milestone.title[:30],
-                "year": year.year_number,
-                "quarter": milestone.quarter,
-                "type": milestone.type,
-                "duration": milestone.estimated_hours,
-                "cost": milestone.estimated_cost,
-            })
-    
-    return data
+def _format_salary(val: float) -> str:
+    """Format a salary for display ($1.2M, $85K, $900)."""
+    if val >= 1000000:
+        return f"${val/1000000:.1f}M"
+    elif val >= 1000:
+        return f"${val/1000:.0f}K"
+    return f"${val:.0f}"
 
 
-def _generate_monthly_projection_chart(state: CareerSimulationState) -> list[dict]:
-    """Generate detailed monthly projection for first 2 years."""
-    data = []
-    
-    financial = state.get("financial_analysis")
-    if not financial or not financial.yearly_financials:
-        return data
-    
-    for year_fin in financial.yearly_financials[:2]:
-        monthly_cost = year_fin.total_investment / 12
-        monthly_income = year_fin.expected_income / 12
-        
-        for month in range(1, 13):
-            month_num = (year_fin.year_number - 1) * 12 + month
-            data.append({
-                "month": f"M{month_num}",
-                "cost": round(monthly_cost, 0),
-                "income": round(monthly_income, 0),
-                "net": round(monthly_income - monthly_cost, 0),
-            })
-    
-    return data
+_PATH_RISK_LEVELS = {"conservative": "Low", "realistic": "Medium", "ambitious": "High"}
+_PATH_SUCCESS_FALLBACK = {"conservative": 85, "realistic": 70, "ambitious": 50}
+
+# Path comparison rows: (metric, cell(path name, path) -> display string)
+_COMPARISON_ROWS: tuple[tuple[str, Callable[[str, CareerPath], str]], ...] = (
+    ("Timeline", lambda name, path: f"{path.total_years} years"),
+    ("Final Salary", lambda name, path: _format_salary(path.final_expected_salary)),
+    ("Risk Level", lambda name, path: _PATH_RISK_LEVELS[name]),
+    ("Success Rate", lambda name, path: f"{getattr(path, 'success_probability', _PATH_SUCCESS_FALLBACK[name]):.0f}%"),
+)
 
 
-def _generate_path_comparison_chart(state: CareerSimulationState) -> list[dict]:
+def _generate_path_comparison_chart(timeline: Optional[TimelineSimulation]) -> list[dict]:
     """Generate path comparison data as rows with metrics across all three paths."""
-    timeline = state.get("timeline_simulation")
     if not timeline:
         return []
     
-    # Get data from each path
-    conservative = timeline.conservative_path
-    realistic = timeline.realistic_path
-    ambitious = timeline.ambitious_path
-    
-    if not conservative or not realistic or not ambitious:
+    paths = _paths_by_name(timeline)
+    if not all(paths.values()):
         return []
     
-    # Format salary for display
-    def format_salary(val):
-        if val >= 1000000:
-            return f"${val/1000000:.1f}M"
-        elif val >= 1000:
-            return f"${val/1000:.0f}K"
-        return f"${val:.0f}"
-    
     # Build comparison table rows
     comparison = [
-        {
-            "metric": "Timeline",
-            "conservative": f"{conservative.total_years} years",
-            "realistic": f"{realistic.total_years} years",
-            "ambitious": f"{ambitious.total_years} years",
-        },
-        {
-            "metric": "Final Salary",
-            "conservative": format_salary(conservative.final_expected_salary),
-            "realistic": format_salary(realistic.final_expected_salary),
-            "ambitious": format_salary(ambitious.final_expected_salary),
-        },
-        {
-            "metric": "Risk Level",
-            "conservative": "Low",
-            "realistic": "Medium",
-            "ambitious": "High",
-        },
-        {
-            "metric": "Success Rate",
-            "conservative": f"{conservative.success_probability:.0f}%" if hasattr(conservative, 'success_probability') else "85%",
-            "realistic": f"{realistic.success_probability:.0f}%" if hasattr(realistic, 'success_probability') else "70%",
-            "ambitious": f"{ambitious.success_probability:.0f}%" if hasattr(ambitious, 'success_probability') else "50%",
-        },
-        {
-            "metric": "Recommended",
-            "conservative": "✓" if timeline.recommended_path == "conservative" else "",
-            "realistic": "✓" if timeline.recommended_path == "realistic" else "",
-            "ambitious": "✓" if timeline.recommended_path == "ambitious" else "",
-        },
+        {"metric": metric, **{name: cell(name, path) for name, path in paths.items()}}
+        for metric, cell in _COMPARISON_ROWS
     ]
+    comparison.append({
+        "metric": "Recommended",
+        **{name: "✓" if timeline.recommended_path == name else "" for name in paths},
+    })
     
     return comparison
 
 
-def _generate_summary_stats(state: CareerSimulationState) -> dict:
+def _generate_summary_stats(
+    risk: Optional[RiskAssessment],
+    financial: Optional[FinancialAnalysis],
+    gap: Optional[GapAnalysis],
+    realistic: Optional[CareerPath],
+    normalized: Optional[NormalizedProfile],
+) -> dict:
     """Generate summary statistics for dashboard cards."""
     stats = {}
     
-    risk = state.get("risk_assessment")
     if risk:
-        stats["success_probability"] = f"{risk.success_probability_score:.0f}%"
+        stats["success_probability"] = _pct(risk.success_probability_score)
         stats["confidence_interval"] = risk.confidence_interval
         stats["compared_to_average"] = risk.compared_to_average
     
-    financial = state.get("financial_analysis")
     if financial:
-        stats["total_investment"] = f"${financial.total_investment_required:,.0f}"
+        stats["total_investment"] = _money(financial.total_investment_required)
         stats["break_even_year"] = f"Year {financial.break_even_year}"
-        stats["roi_5_year"] = f"{financial.five_year_roi:.0f}%"
+        stats["roi_5_year"] = _pct(financial.five_year_roi)
         stats["affordability"] = financial.affordability_rating.title()
     
-    gap = state.get("gap_analysis")
     if gap:
         stats["gap_score"] = f"{gap.overall_gap_score:.0f}/100"
         stats["gap_category"] = gap.gap_category.title()
         stats["skill_gaps_count"] = len(gap.technical_skill_gaps)
     
-    timeline = state.get("timeline_simulation")
-    if timeline and timeline.realistic_path:
-        path = timeline.realistic_path
-        stats["timeline_years"] = f"{path.total_years} Years"
-        stats["target_role"] = path.final_target_role
-        stats["expected_salary"] = f"${path.final_expected_salary:,.0f}"
+    if realistic:
+        stats["timeline_years"] = f"{realistic.total_years} Years"
+        stats["target_role"] = realistic.final_target_role
+        stats["expected_salary"] = _money(realistic.final_expected_salary)
     
-    normalized = state.get("normalized_profile")
     if normalized:
         stats["persona"] = normalized.persona_type
         stats["academic_score"] = f"{normalized.academic_strength_score:.0f}/100"
@@ -507,38 +528,40 @@ def _generate_summary_stats(state: CareerSimulationState) -> dict:
     return stats
 
 
-def _generate_key_metrics(state: CareerSimulationState) -> list[dict]:
-    """Generate key metrics for metric cards."""
+def _generate_key_metrics(
+    risk: Optional[RiskAssessment],
+    financial: Optional[FinancialAnalysis],
+    timeline: Optional[TimelineSimulation],
+    stats: dict,
+) -> list[dict]:
+    """Generate key metrics for metric cards (values reuse the formatted summary stats)."""
     metrics = []
     
-    risk = state.get("risk_assessment")
     if risk:
         metrics.append({
             "title": "Success Rate",
-            "value": f"{risk.success_probability_score:.0f}%",
-            "description": risk.success_reasoning[:100] if hasattr(risk, 'success_reasoning') and risk.success_reasoning else "Based on profile analysis",
+            "value": stats["success_probability"],
+            "description": (risk.success_reasoning or "Based on profile analysis")[:100],
             "type": "success",
             "icon": "target",
         })
     
-    financial = state.get("financial_analysis")
     if financial:
         metrics.append({
             "title": "Total Investment",
-            "value": f"${financial.total_investment_required:,.0f}",
-            "description": financial.investment_reasoning[:100] if hasattr(financial, 'investment_reasoning') and financial.investment_reasoning else "Courses, certifications, and tools",
+            "value": stats["total_investment"],
+            "description": (financial.investment_reasoning or "Courses, certifications, and tools")[:100],
             "type": "financial",
             "icon": "dollar",
         })
         metrics.append({
             "title": "5-Year ROI",
-            "value": f"{financial.five_year_roi:.0f}%",
-            "description": financial.five_year_roi_reasoning[:100] if hasattr(financial, 'five_year_roi_reasoning') and financial.five_year_roi_reasoning else "Return on your investment",
+            "value": stats["roi_5_year"],
+            "description": (financial.five_year_roi_reasoning or "Return on your investment")[:100],
             "type": "roi",
             "icon": "trending",
         })
     
-    timeline = state.get("timeline_simulation")
     if timeline and timeline.realistic_path:
         metrics.append({
             "title": "Timeline",
@@ -551,19 +574,18 @@ def _generate_key_metrics(state: CareerSimulationState) -> list[dict]:
     return metrics
 
 
-def _generate_timeline_events(state: CareerSimulationState) -> list[dict]:
+def _generate_timeline_events(realistic: Optional[CareerPath]) -> list[dict]:
     """Generate timeline events list."""
     events = []
     
-    timeline = state.get("timeline_simulation")
-    if not timeline or not timeline.realistic_path:
+    if not realistic:
         return events
     
-    path = timeline.realistic_path
+    add_event = events.append
     
-    for year in path.yearly_plans:
+    for year in realistic.yearly_plans:
         # Add year as event
-        events.append({
+        add_event({
             "id": f"year_{year.year_number}",
             "title": year.year_label,
             "description": year.primary_focus,
@@ -572,12 +594,12 @@ def _generate_timeline_events(state: CareerSimulationState) -> list[dict]:
             "type": "year",
             "expected_role": year.expected_role,
             "expected_salary": year.expected_salary_range,
-            "reasoning": year.phase_reasoning if hasattr(year, 'phase_reasoning') else "",
+            "reasoning": year.phase_reasoning,
         })
         
         # Add milestones
         for m in year.milestones:
-            events.append({
+            add_event({
                 "id": f"milestone_{year.year_number}_{m.quarter}",
                 "title": m.title,
                 "description": m.description,
@@ -586,22 +608,25 @@ def _generate_timeline_events(state: CareerSimulationState) -> list[dict]:
                 "type": m.type,
                 "cost": m.estimated_cost,
                 "hours": m.estimated_hours,
-                "reasoning": m.reasoning if hasattr(m, 'reasoning') else "",
+                "reasoning": m.reasoning,
             })
     
     return events
 
 
-def _generate_key_insights(state: CareerSimulationState) -> list[dict]:
+def _generate_key_insights(
+    gap: Optional[GapAnalysis],
+    risk: Optional[RiskAssessment],
+    financial: Optional[FinancialAnalysis],
+) -> list[dict]:
     """Generate key insights with reasoning."""
     insights = []
     
-    gap = state.get("gap_analysis")
     if gap:
         insights.append({
             "title": "Skills Gap Assessment",
             "insight": f"Overall gap score: {gap.overall_gap_score:.0f}/100 ({gap.gap_category})",
-            "reasoning": gap.analysis_reasoning if hasattr(gap, 'analysis_reasoning') and gap.analysis_reasoning else "Based on comparison with market requirements",
+            "reasoning": gap.analysis_reasoning or "Based on comparison with market requirements",
             "type": "gap",
             "priority": "high" if gap.overall_gap_score > 50 else "medium",
         })
@@ -615,17 +640,16 @@ def _generate_key_insights(state: CareerSimulationState) -> list[dict]:
                 "priority": "positive",
             })
     
-    risk = state.get("risk_assessment")
     if risk:
         insights.append({
             "title": "Success Probability",
             "insight": f"{risk.success_probability_score:.0f}% chance of success ({risk.confidence_interval})",
-            "reasoning": risk.success_reasoning if hasattr(risk, 'success_reasoning') and risk.success_reasoning else "Based on comprehensive risk analysis",
+            "reasoning": risk.success_reasoning or "Based on comprehensive risk analysis",
             "type": "risk",
             "priority": "high" if risk.success_probability_score < 60 else "medium",
         })
         
-        if hasattr(risk, 'key_opportunities') and risk.key_opportunities:
+        if risk.key_opportunities:
             insights.append({
                 "title": "Key Opportunities",
                 "insight": risk.key_opportunities[0] if risk.key_opportunities else "Market is favorable",
@@ -634,12 +658,11 @@ def _generate_key_insights(state: CareerSimulationState) -> list[dict]:
                 "priority": "positive",
             })
     
-    financial = state.get("financial_analysis")
     if financial:
         insights.append({
             "title": "Financial Outlook",
             "insight": f"Break-even in Year {financial.break_even_year} with {financial.five_year_roi:.0f}% 5-year ROI",
-            "reasoning": financial.break_even_reasoning if hasattr(financial, 'break_even_reasoning') and financial.break_even_reasoning else "Based on investment vs income projections",
+            "reasoning": financial.break_even_reasoning or "Based on investment vs income projections",
             "type": "financial",
             "priority": "medium",
         })
@@ -647,11 +670,13 @@ def _generate_key_insights(state: CareerSimulationState) -> list[dict]:
     return insights
 
 
-def _generate_decision_rationale(state: CareerSimulationState) -> list[dict]:
+def _generate_decision_rationale(
+    timeline: Optional[TimelineSimulation],
+    selected: Optional[CareerFit],
+) -> list[dict]:
     """Generate decision rationale for key decisions."""
     rationale = []
     
-    timeline = state.get("timeline_simulation")
     if timeline:
         rationale.append({
             "decision": f"Recommended Path: {timeline.recommended_path.title()}",
@@ -659,7 +684,6 @@ def _generate_decision_rationale(state: CareerSimulationState) -> list[dict]:
             "impact": "This path balances achievability with your career goals",
         })
     
-    selected = state.get("selected_career")
     if selected:
         rationale.append({
             "decision": f"Target Career: {selected.career_title}",
@@ -670,31 +694,34 @@ def _generate_decision_rationale(state: CareerSimulationState) -> list[dict]:
     return rationale
 
 
-def _generate_top_recommendations(state: CareerSimulationState) -> list[str]:
+def _generate_top_recommendations(
+    risk: Optional[RiskAssessment],
+    gap: Optional[GapAnalysis],
+) -> list[str]:
     """Generate top recommendations."""
     recommendations = []
     
-    risk = state.get("risk_assessment")
-    if risk and hasattr(risk, 'recommendations') and risk.recommendations:
+    if risk and risk.recommendations:
         recommendations.extend(risk.recommendations[:3])
     elif risk and risk.risk_mitigation_plan:
         recommendations.extend(risk.risk_mitigation_plan[:3])
     
-    gap = state.get("gap_analysis")
-    if gap and hasattr(gap, 'top_priorities') and gap.top_priorities:
+    if gap and gap.top_priorities:
         recommendations.extend(gap.top_priorities[:2])
     
     return recommendations[:5]
 
 
-def _generate_immediate_actions(state: CareerSimulationState) -> list[dict]:
+def _generate_immediate_actions(
+    gap: Optional[GapAnalysis],
+    realistic: Optional[CareerPath],
+) -> list[dict]:
     """Generate immediate action items."""
     actions = []
     
-    gap = state.get("gap_analysis")
     if gap:
         # Add quick wins
-        if hasattr(gap, 'quick_wins') and gap.quick_wins:
+        if gap.quick_wins:
             for qw in gap.quick_wins[:2]:
                 actions.append({
                     "action": qw,
@@ -713,11 +740,10 @@ def _generate_immediate_actions(state: CareerSimulationState) -> list[dict]:
                 "impact": f"Close {top_gap.gap_severity:.0f}% gap",
             })
     
-    timeline = state.get("timeline_simulation")
-    if timeline and timeline.realistic_path:
-        path = timeline.realistic_path
-        if path.yearly_plans and path.yearly_plans[0].milestones:
-            first_milestone = path.yearly_plans[0].milestones[0]
+    if realistic:
+        yearly_plans = realistic.yearly_plans
+        if yearly_plans and yearly_plans[0].milestones:
+            first_milestone = yearly_plans[0].milestones[0]
             actions.append({
                 "action": first_milestone.title,
                 "priority": "medium",
@@ -728,11 +754,10 @@ def _generate_immediate_actions(state: CareerSimulationState) -> list[dict]:
     return actions[:5]
 
 
-def _generate_risk_indicators(state: CareerSimulationState) -> list[dict]:
+def _generate_risk_indicators(risk: Optional[RiskAssessment]) -> list[dict]:
     """Generate risk indicator data."""
     indicators = []
     
-    risk = state.get("risk_assessment")
     if not risk:
         return indicators
     
@@ -743,16 +768,15 @@ def _generate_risk_indicators(state: CareerSimulationState) -> list[dict]:
             "severity": rf.severity,
             "probability": rf.probability,
             "impact": rf.impact_description,
-            "reasoning": rf.reasoning if hasattr(rf, 'reasoning') else "",
+            "reasoning": rf.reasoning,
             "mitigation": rf.mitigation_strategies[0] if rf.mitigation_strategies else "",
         })
     
     return indicators
 
 
-def _generate_selected_career_summary(state: CareerSimulationState) -> dict:
+def _generate_selected_career_summary(selected: Optional[CareerFit]) -> dict:
     """Generate selected career summary for context."""
-    selected = state.get("selected_career")
     if not selected:
         return {}
     
@@ -769,16 +793,17 @@ def _generate_selected_career_summary(state: CareerSimulationState) -> dict:
     }
 
 
-def _generate_final_summary(state: CareerSimulationState) -> str:
+def _generate_final_summary(
+    profile: CareerProfile,
+    normalized: Optional[NormalizedProfile],
+    timeline: Optional[TimelineSimulation],
+    risk: Optional[RiskAssessment],
+    financial: Optional[FinancialAnalysis],
+    selected: Optional[CareerFit],
+) -> str:
     """Generate a final summary text for the report."""
-    profile = state["career_profile"]
-    normalized = state.get("normalized_profile")
-    timeline = state.get("timeline_simulation")
-    risk = state.get("risk_assessment")
-    financial = state.get("financial_analysis")
-    selected = state.get("selected_career")
-    
     summary_parts = []
+    add = summary_parts.append
     
     # Header
     if selected:
@@ -788,79 +813,78 @@ def _generate_final_summary(state: CareerSimulationState) -> str:
     else:
         target_role = "your target role"
     
-    summary_parts.append(f"# Career Path Simulation Report: {target_role}\n")
+    add(f"# Career Path Simulation Report: {target_role}\n")
     
     # Persona
     if normalized:
-        summary_parts.append(f"**Your Profile Type:** {normalized.persona_type}\n")
+        add(f"**Your Profile Type:** {normalized.persona_type}\n")
     
     # Success probability with reasoning
     if risk:
-        summary_parts.append(
+        add(
             f"**Success Probability:** {risk.success_probability_score:.0f}% "
             f"(Confidence: {risk.confidence_interval})\n"
         )
-        if hasattr(risk, 'success_reasoning') and risk.success_reasoning:
-            summary_parts.append(f"*Why:* {risk.success_reasoning}\n")
+        if risk.success_reasoning:
+            add(f"*Why:* {risk.success_reasoning}\n")
     
     # Career fit summary
     if selected:
-        summary_parts.append(
+        add(
             f"\n## Selected Career: {selected.career_title}\n"
             f"- **Overall Fit:** {selected.overall_fit_score:.0f}%\n"
             f"- **Salary Range:** {selected.typical_salary_range}\n"
             f"- **Time to Entry:** {selected.time_to_entry}\n"
         )
         if selected.top_3_reasons:
-            summary_parts.append("**Top Reasons:**\n")
-            for reason in selected.top_3_reasons:
-                summary_parts.append(f"  - {reason}\n")
+            add("**Top Reasons:**\n")
+            summary_parts.extend(f"  - {reason}\n" for reason in selected.top_3_reasons)
     
     # Timeline overview
     if timeline and timeline.realistic_path:
         path = timeline.realistic_path
-        summary_parts.append(
+        add(
             f"\n## Recommended Path: {path.path_label}\n"
             f"- **Duration:** {path.total_years} years\n"
             f"- **Target Role:** {path.final_target_role}\n"
             f"- **Expected Salary:** ${path.final_expected_salary:,.0f}\n"
         )
         if timeline.recommendation_reason:
-            summary_parts.append(f"*Why this path:* {timeline.recommendation_reason}\n")
+            add(f"*Why this path:* {timeline.recommendation_reason}\n")
     
     # Financial summary with reasoning
     if financial:
-        summary_parts.append(
+        add(
             f"\n## Financial Summary\n"
             f"- **Total Investment:** ${financial.total_investment_required:,.0f}\n"
             f"- **Break-Even Point:** Year {financial.break_even_year}\n"
             f"- **5-Year ROI:** {financial.five_year_roi:.0f}%\n"
             f"- **Affordability:** {financial.affordability_rating.title()}\n"
         )
-        if hasattr(financial, 'investment_reasoning') and financial.investment_reasoning:
-            summary_parts.append(f"*Investment rationale:* {financial.investment_reasoning}\n")
+        if financial.investment_reasoning:
+            add(f"*Investment rationale:* {financial.investment_reasoning}\n")
     
     # Key risks with reasoning
     if risk and risk.risk_factors:
-        summary_parts.append("\n## Key Risks\n")
-        for rf in risk.risk_factors[:3]:
-            summary_parts.append(f"- **{rf.factor_name}** ({rf.severity}): {rf.impact_description}\n")
-            if rf.mitigation_strategies:
-                summary_parts.append(f"  *Mitigation:* {rf.mitigation_strategies[0]}\n")
+        add("\n## Key Risks\n")
+        summary_parts.extend(
+            f"- **{rf.factor_name}** ({rf.severity}): {rf.impact_description}\n"
+            + (f"  *Mitigation:* {rf.mitigation_strategies[0]}\n" if rf.mitigation_strategies else "")
+            for rf in risk.risk_factors[:3]
+        )
     
     # Scenarios
     if risk:
-        if hasattr(risk, 'best_case_scenario') and risk.best_case_scenario:
-            summary_parts.append(f"\n**Best Case:** {risk.best_case_scenario}\n")
-        if hasattr(risk, 'most_likely_scenario') and risk.most_likely_scenario:
-            summary_parts.append(f"**Most Likely:** {risk.most_likely_scenario}\n")
-        if hasattr(risk, 'worst_case_scenario') and risk.worst_case_scenario:
-            summary_parts.append(f"**Worst Case:** {risk.worst_case_scenario}\n")
+        if risk.best_case_scenario:
+            add(f"\n**Best Case:** {risk.best_case_scenario}\n")
+        if risk.most_likely_scenario:
+            add(f"**Most Likely:** {risk.most_likely_scenario}\n")
+        if risk.worst_case_scenario:
+            add(f"**Worst Case:** {risk.worst_case_scenario}\n")
     
     # Vibe check warnings
     if timeline and timeline.vibe_check_warnings:
-        summary_parts.append("\n## Important Considerations\n")
-        for warning in timeline.vibe_check_warnings[:3]:
-            summary_parts.append(f"- {warning}\n")
+        add("\n## Important Considerations\n")
+        summary_parts.extend(f"- {warning}\n" for warning in timeline.vibe_check_warnings[:3])
     
     return "".join(summary_parts)
@@ -4,10 +4,20 @@ The ROI Calculator - Calculates cost of roadmap vs potential earnings
 Uses structured output for reliable data extraction
 """
 
+import os
+import re
 import time
+import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import accumulate
 from typing import Optional
+import orjson
 from pydantic import BaseModel, Field
-from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.messages import SystemMessage
+from langchain_core.prompts import ChatPromptTemplate, HumanMessagePromptTemplate
 
 from ..models.state import (
     CareerSimulationState,
@@ -15,7 +25,7 @@ from ..models.state import (
     YearlyFinancials,
     CostBreakdown,
 )
-from .base import get_llm
+from .base import get_llm, DEFAULT_AGENT_CONFIG
 
 
 # Structured output models for LLM response
@@ -35,9 +45,7 @@ class YearlyFinancialsOutput(BaseModel):
     costs: list[CostItemOutput] = Field(description="Detailed cost breakdown with 3-6 items")
     expected_income: float = Field(description="Expected income for this year")
     income_source: str = Field(description="Source: None, Internship, Part-time, Full-time, Freelance")
-    net_cash_flow: float = Field(description="Net cash flow (income - costs)")
-    cumulative_investment: float = Field(description="Running total of all investments")
-    cumulative_income: float = Field(description="Running total of all income")
+    # Net cash flow and cumulative totals are derived locally, not generated
 
 
 class FinancialAnalysisOutput(BaseModel):
@@ -69,8 +77,7 @@ class FinancialAnalysisOutput(BaseModel):
     )
 
 
-FINANCIAL_ANALYSIS_PROMPT = ChatPromptTemplate.from_messages([
-    ("system", """You are an expert financial advisor specializing in education ROI and career investment analysis.
+_SYSTEM_PROMPT = """You are an expert financial advisor specializing in education ROI and career investment analysis.
 
 Your task is to provide DETAILED financial analysis WITH REASONING including:
 
@@ -78,8 +85,7 @@ Your task is to provide DETAILED financial analysis WITH REASONING including:
 2. Yearly Financials - For EACH year, provide:
    - 4-6 specific cost items (courses, certifications, tools, books, etc.)
    - Expected income (if any - internships, part-time, full-time)
-   - Net cash flow
-   - Cumulative totals
+   (Net cash flow and cumulative totals are calculated for you - do not repeat them)
 
 3. Break-Even Analysis - When does income exceed investment? EXPLAIN WHY at this point
 4. ROI Metrics - 5-year ROI percentage WITH CALCULATION REASONING, 10-year projected earnings
@@ -101,9 +107,9 @@ IMPORTANT: For each major number (total investment, ROI, break-even), provide de
 - What factors influenced it
 - How it relates to the candidate's specific situation
 
-NEVER leave arrays empty. Provide realistic, detailed breakdowns."""),
+NEVER leave arrays empty. Provide realistic, detailed breakdowns."""
 
-    ("human", """Perform a comprehensive financial analysis:
+_HUMAN_PROMPT = """Perform a comprehensive financial analysis:
 
 **USER FINANCIAL PROFILE:**
 - Investment Capacity: {investment_capacity}
@@ -133,10 +139,66 @@ Provide detailed financial projections with:
 3. Break-even reasoning showing when and why income exceeds costs
 4. ROI reasoning with calculation methodology
 5. Affordability reasoning based on the user's capacity
-6. Salary milestones showing progression""")
+6. Salary milestones showing progression"""
+
+FINANCIAL_ANALYSIS_PROMPT = ChatPromptTemplate.from_messages([
+    SystemMessage(content=_SYSTEM_PROMPT),
+    HumanMessagePromptTemplate.from_template(_HUMAN_PROMPT),
 ])
 
 
+FINANCIAL_ADVISOR_TEMPERATURE = 0.3
+
+# Wall-clock budget for the LLM call (retries included) before falling back
+FINANCIAL_ADVISOR_DEADLINE_SECONDS = float(os.getenv("FINANCIAL_ADVISOR_DEADLINE_SECONDS", 45))
+# Longest with_retry backoff between attempts (exponential delay plus up to 1s jitter)
+_RETRY_BACKOFF_SECONDS = sum(
+    DEFAULT_AGENT_CONFIG.retry_delay * 2 ** i + 1 for i in range(DEFAULT_AGENT_CONFIG.max_retries - 1)
+)
+# Per-attempt timeout sized so every attempt and backoff fits inside the
+# deadline, which also bounds the sync node
+FINANCIAL_ADVISOR_ATTEMPT_TIMEOUT_SECONDS = max(
+    1.0,
+    (FINANCIAL_ADVISOR_DEADLINE_SECONDS - _RETRY_BACKOFF_SECONDS) / DEFAULT_AGENT_CONFIG.max_retries,
+)
+
+# In-process cache of LLM responses keyed by a hash of the prompt inputs
+RESPONSE_CACHE_ENABLED = os.getenv("CACHE_ENABLED", "false").lower() == "true"
+RESPONSE_CACHE_SIZE = 512
+_response_cache: OrderedDict[str, str] = OrderedDict()
+_response_cache_lock = threading.Lock()
+
+# Market salary band for the prompt, e.g. "50000 - 80000"
+_salary_band = "{:.0f} - {:.0f}".format
+
+
+@lru_cache(maxsize=8)
+def _get_chain(temperature: float):
+    """Build the prompt -> structured-output chain once per temperature."""
+    # with_retry is the only retry layer, so the SDK's own retries are disabled
+    llm = get_llm(
+        temperature=temperature,
+        timeout=FINANCIAL_ADVISOR_ATTEMPT_TIMEOUT_SECONDS,
+        max_retries=0,
+    )
+    structured_llm = llm.with_structured_output(FinancialAnalysisOutput)
+    # Bounded retry with exponential backoff before falling back to templates
+    return (FINANCIAL_ANALYSIS_PROMPT | structured_llm).with_retry(
+        stop_after_attempt=DEFAULT_AGENT_CONFIG.max_retries,
+        exponential_jitter_params={"initial": DEFAULT_AGENT_CONFIG.retry_delay},
+    )
+
+
+def warm_financial_advisor() -> None:
+    """
+    Build the FinancialAdvisor chain ahead of the first simulation.
+    
+    The nested FinancialAnalysisOutput schema is converted to a tool schema
+    when the chain is built, so this keeps it off the first /simulate call.
+    """
+    _get_chain(FINANCIAL_ADVISOR_TEMPERATURE)
+
+
 def financial_advisor_node(state: CareerSimulationState) -> dict:
     """
     Node E: FinancialAdvisor
@@ -146,34 +208,90 @@ def financial_advisor_node(state: CareerSimulationState) -> dict:
     start_time = time.time()
     
     profile = state["career_profile"]
-    market = state.get("market_insights")
-    timeline = state.get("timeline_simulation")
     gap = state.get("gap_analysis")
+    career_path = _select_career_path(state.get("timeline_simulation"))
+    
+    # Without a roadmap there is nothing specific to cost; skip the LLM round-trip
+    if career_path is None:
+        return _financial_update(_create_fallback_financial_analysis(None, profile, gap), start_time)
+    
+    inputs = _build_prompt_inputs(profile, career_path, state.get("market_insights"), gap)
+    
+    try:
+        analysis_output = _analyze_financials(inputs)
+        
+        # Convert to FinancialAnalysis model
+        financial_analysis = _convert_to_financial_analysis(analysis_output)
+        
+    except Exception as e:
+        # Fallback if structured output fails
+        print(f"Structured output failed, using fallback: {e}")
+        financial_analysis = _create_fallback_financial_analysis(career_path, profile, gap)
+    
+    return _financial_update(financial_analysis, start_time)
+
+
+async def financial_advisor_node_async(state: CareerSimulationState) -> dict:
+    """Async variant of financial_advisor_node using chain.ainvoke."""
+    start_time = time.time()
+    
+    profile = state["career_profile"]
+    gap = state.get("gap_analysis")
+    career_path = _select_career_path(state.get("timeline_simulation"))
+    
+    # Without a roadmap there is nothing specific to cost; skip the LLM round-trip
+    if career_path is None:
+        return _financial_update(_create_fallback_financial_analysis(None, profile, gap), start_time)
     
-    # Get the recommended path (or realistic if not available)
-    career_path = None
-    if timeline:
-        if timeline.recommended_path == "conservative" and timeline.conservative_path:
-            career_path = timeline.conservative_path
-        elif timeline.recommended_path == "ambitious" and timeline.ambitious_path:
-            career_path = timeline.ambitious_path
-        elif timeline.realistic_path:
-            career_path = timeline.realistic_path
+    inputs = _build_prompt_inputs(profile, career_path, state.get("market_insights"), gap)
     
-    # Format career path summary
-    career_path_summary = _format_career_path(career_path)
+    try:
+        # A stalled provider falls back instead of holding up the dashboard
+        analysis_output = await asyncio.wait_for(
+            _analyze_financials_async(inputs), FINANCIAL_ADVISOR_DEADLINE_SECONDS
+        )
+        financial_analysis = _convert_to_financial_analysis(analysis_output)
+    except Exception as e:
+        print(f"Structured output failed, using fallback: {e!r}")
+        financial_analysis = _create_fallback_financial_analysis(career_path, profile, gap)
     
+    return _financial_update(financial_analysis, start_time)
+
+
+def _financial_update(financial_analysis: FinancialAnalysis, start_time: float) -> dict:
+    """Build the state update shared by the sync and async nodes."""
+    processing_time = (time.time() - start_time) * 1000
+    
+    return {
+        "financial_analysis": financial_analysis,
+        "current_node": "financial_advisor",
+        "processing_time_ms": {"financial_advisor": processing_time},
+    }
+
+
+def _select_career_path(timeline):
+    """Get the recommended path (or realistic if not available)."""
+    if not timeline:
+        return None
+    if timeline.recommended_path == "conservative" and timeline.conservative_path:
+        return timeline.conservative_path
+    if timeline.recommended_path == "ambitious" and timeline.ambitious_path:
+        return timeline.ambitious_path
+    return timeline.realistic_path
+
+
+def _build_prompt_inputs(profile, career_path, market, gap) -> dict:
+    """Collect the FINANCIAL_ANALYSIS_PROMPT variables."""
     # Get salary data
     entry_salary = "50000 - 80000"
     mid_salary = "80000 - 120000"
     senior_salary = "120000 - 180000"
     
-    if market and market.target_roles:
-        role = market.target_roles[0]
-        if role.salary_range:
-            entry_salary = f"{role.salary_range.entry_level_min:.0f} - {role.salary_range.entry_level_max:.0f}"
-            mid_salary = f"{role.salary_range.mid_level_min:.0f} - {role.salary_range.mid_level_max:.0f}"
-            senior_salary = f"{role.salary_range.senior_level_min:.0f} - {role.salary_range.senior_level_max:.0f}"
+    salary_range = market.target_roles[0].salary_range if market and market.target_roles else None
+    if salary_range:
+        entry_salary = _salary_band(salary_range.entry_level_min, salary_range.entry_level_max)
+        mid_salary = _salary_band(salary_range.mid_level_min, salary_range.mid_level_max)
+        senior_salary = _salary_band(salary_range.senior_level_min, salary_range.senior_level_max)
     
     # Format gaps
     skill_gaps = "General skill development needed"
@@ -184,46 +302,81 @@ def financial_advisor_node(state: CareerSimulationState) -> dict:
         if gap.certification_gaps:
             cert_gaps = ", ".join(gap.certification_gaps)
     
-    total_years = career_path.total_years if career_path else 5
-    target_role = career_path.final_target_role if career_path else "Software Engineer"
+    return {
+        "investment_capacity": profile.investment_capacity or "Medium ($5,000 - $15,000)",
+        "has_dependents": "Yes" if profile.financial_dependents else "No",
+        "target_salary": profile.target_min_salary or 80000,
+        "country": profile.current_country or "United States",
+        "career_path_summary": _format_career_path(career_path),
+        "entry_salary": entry_salary,
+        "mid_salary": mid_salary,
+        "senior_salary": senior_salary,
+        "skill_gaps": skill_gaps,
+        "cert_gaps": cert_gaps,
+        "total_years": career_path.total_years if career_path else 5,
+        "target_role": career_path.final_target_role if career_path else "Software Engineer",
+    }
+
+
+def _response_cache_key(inputs: dict) -> str:
+    """Hash the prompt inputs into a response cache key."""
+    return hashlib.blake2b(
+        orjson.dumps(inputs, option=orjson.OPT_SORT_KEYS), digest_size=16
+    ).hexdigest()
+
+
+def _get_cached_response(cache_key: str) -> Optional[FinancialAnalysisOutput]:
+    """Return the cached structured response for identical prompt inputs."""
+    with _response_cache_lock:
+        cached = _response_cache.get(cache_key)
+        if cached is not None:
+            _response_cache.move_to_end(cache_key)
+    if cached is None:
+        return None
+    return FinancialAnalysisOutput.model_validate_json(cached)
+
+
+def _cache_response(cache_key: str, result: FinancialAnalysisOutput) -> None:
+    """Store a structured response, evicting the least recently used entry."""
+    with _response_cache_lock:
+        _response_cache[cache_key] = result.model_dump_json()
+        while len(_response_cache) > RESPONSE_CACHE_SIZE:
+            _response_cache.popitem(last=False)
+
+
+def _analyze_financials(inputs: dict) -> FinancialAnalysisOutput:
+    """Use LLM with structured output to build the financial analysis."""
+    if not RESPONSE_CACHE_ENABLED:
+        return _get_chain(FINANCIAL_ADVISOR_TEMPERATURE).invoke(inputs)
     
-    # Get LLM with structured output
-    llm = get_llm(temperature=0.3)
+    # Identical prompt inputs reuse the previous structured response
+    cache_key = _response_cache_key(inputs)
+    cached = _get_cached_response(cache_key)
+    if cached is not None:
+        return cached
     
-    try:
-        structured_llm = llm.with_structured_output(FinancialAnalysisOutput)
-        chain = FINANCIAL_ANALYSIS_PROMPT | structured_llm
-        
-        analysis_output: FinancialAnalysisOutput = chain.invoke({
-            "investment_capacity": profile.investment_capacity or "Medium ($5,000 - $15,000)",
-            "has_dependents": "Yes" if profile.financial_dependents else "No",
-            "target_salary": profile.target_min_salary or 80000,
-            "country": profile.current_country or "United States",
-            "career_path_summary": career_path_summary,
-            "entry_salary": entry_salary,
-            "mid_salary": mid_salary,
-            "senior_salary": senior_salary,
-            "skill_gaps": skill_gaps,
-            "cert_gaps": cert_gaps,
-            "total_years": total_years,
-            "target_role": target_role,
-        })
-        
-        # Convert to FinancialAnalysis model
-        financial_analysis = _convert_to_financial_analysis(analysis_output)
-        
-    except Exception as e:
-        # Fallback if structured output fails
-        print(f"Structured output failed, using fallback: {e}")
-        financial_analysis = _create_fallback_financial_analysis(career_path, profile, gap)
+    result = _get_chain(FINANCIAL_ADVISOR_TEMPERATURE).invoke(inputs)
+    _cache_response(cache_key, result)
+    return result
+
+
+async def _analyze_financials_async(inputs: dict) -> FinancialAnalysisOutput:
+    """Async variant of _analyze_financials using chain.ainvoke."""
+    if not RESPONSE_CACHE_ENABLED:
+        return await _get_chain(FINANCIAL_ADVISOR_TEMPERATURE).ainvoke(inputs)
     
-    processing_time = (time.time() - start_time) * 1000
+    cache_key = _response_cache_key(inputs)
+    cached = _get_cached_response(cache_key)
+    if cached is not None:
+        return cached
     
-    return {
-        "financial_analysis": financial_analysis,
-        "current_node": "financial_advisor",
-        "processing_time_ms": {"financial_advisor": processing_time},
-    }
+    result = await _get_chain(FINANCIAL_ADVISOR_TEMPERATURE).ainvoke(inputs)
+    _cache_response(cache_key, result)
+    return result
+
+
+# "Year 1: $50,000" -> year before the colon, first amount after it
+_MILESTONE_RE = re.compile(r"(\d+)[^:]*:\D*([\d,.]+)")
 
 
 def _convert_to_financial_analysis(output: FinancialAnalysisOutput) -> FinancialAnalysis:
@@ -236,19 +389,19 @@ def _convert_to_financial_analysis(output: FinancialAnalysisOutput) -> Financial
                 salary_milestones.append(item)
             elif isinstance(item, str):
                 # Parse string format like "Year 1: $50,000"
-                try:
-                    parts = item.replace('$', '').replace(',', '').split(':')
-                    if len(parts) >= 2:
-                        year = int(''.join(filter(str.isdigit, parts[0])))
-                        salary = int(float(''.join(filter(lambda c: c.isdigit() or c == '.', parts[1]))))
-                        salary_milestones.append({
-                            "year": year,
-                            "expected_salary": salary,
-                            "role": f"Year {year} Role",
-                            "reasoning": "Parsed from string format"
-                        })
-                except:
-                    pass
+                match = _MILESTONE_RE.search(item)
+                if match:
+                    try:
+                        salary = int(float(match.group(2).replace(',', '')))
+                    except ValueError:
+                        continue
+                    year = int(match.group(1))
+                    salary_milestones.append({
+                        "year": year,
+                        "expected_salary": salary,
+                        "role": f"Year {year} Role",
+                        "reasoning": "Parsed from string format"
+                    })
     
     # Safely handle investment_by_category - convert list to dict if needed
     investment_by_category = {}
@@ -261,7 +414,36 @@ def _convert_to_financial_analysis(output: FinancialAnalysisOutput) -> Financial
             elif isinstance(item, dict) and 'category' in item and 'amount' in item:
                 investment_by_category[item['category']] = item['amount']
     
-    analysis = FinancialAnalysis(
+    # Convert yearly financials, deriving the running totals
+    yearly_outputs = output.yearly_financials
+    yearly_financials = [
+        YearlyFinancials(
+            year_number=yf.year_number,
+            total_investment=yf.total_investment,
+            expected_income=yf.expected_income,
+            income_source=yf.income_source,
+            net_cash_flow=yf.expected_income - yf.total_investment,
+            cumulative_investment=cumulative_investment,
+            cumulative_income=cumulative_income,
+            cost_breakdown=[
+                CostBreakdown(
+                    item_name=cost.item_name,
+                    amount=cost.amount,
+                    category=cost.category,
+                    is_recurring=cost.is_recurring,
+                    frequency=cost.frequency,
+                )
+                for cost in yf.costs
+            ],
+        )
+        for yf, cumulative_investment, cumulative_income in zip(
+            yearly_outputs,
+            accumulate(yf.total_investment for yf in yearly_outputs),
+            accumulate(yf.expected_income for yf in yearly_outputs),
+        )
+    ]
+    
+    return FinancialAnalysis(
         total_investment_required=output.total_investment_required,
         investment_reasoning=output.investment_reasoning,
         break_even_year=output.break_even_year,
@@ -280,33 +462,44 @@ def _convert_to_financial_analysis(output: FinancialAnalysisOutput) -> Financial
         salary_target_reasoning=output.salary_target_reasoning,
         salary_milestones=salary_milestones,
         investment_by_category=investment_by_category,
+        yearly_financials=yearly_financials,
     )
-    
-    # Convert yearly financials
-    for yf in output.yearly_financials:
-        yearly = YearlyFinancials(
-            year_number=yf.year_number,
-            total_investment=yf.total_investment,
-            expected_income=yf.expected_income,
-            income_source=yf.income_source,
-            net_cash_flow=yf.net_cash_flow,
-            cumulative_investment=yf.cumulative_investment,
-            cumulative_income=yf.cumulative_income,
-        )
-        
-        # Convert cost breakdown
-        for cost in yf.costs:
-            yearly.cost_breakdown.append(CostBreakdown(
-                item_name=cost.item_name,
-                amount=cost.amount,
-                category=cost.category,
-                is_recurring=cost.is_recurring,
-                frequency=cost.frequency,
-            ))
-        
-        analysis.yearly_financials.append(yearly)
-    
-    return analysis
+
+
+def _fallback_plan(costs: tuple, income: int, income_source: str) -> tuple:
+    """Bundle a fallback year's costs with their precomputed total."""
+    return costs, sum(c[1] for c in costs), income, income_source
+
+
+# Fallback yearly plans: (costs, total_investment, expected_income, income_source)
+_FALLBACK_YEARLY_PLANS = (
+    _fallback_plan((
+        ("Online Courses (Coursera, Udemy)", 500, "education", False, "one-time"),
+        ("Books and Learning Materials", 200, "education", False, "one-time"),
+        ("Cloud Platform Credits", 100, "tools", True, "yearly"),
+        ("Development Tools", 150, "tools", True, "yearly"),
+        ("Certification Prep Materials", 250, "certification", False, "one-time"),
+    ), 0, "None"),
+    _fallback_plan((
+        ("Advanced Courses", 400, "education", False, "one-time"),
+        ("AWS Certification Exam", 150, "certification", False, "one-time"),
+        ("Professional Tools", 200, "tools", True, "yearly"),
+        ("Networking Events", 100, "networking", False, "one-time"),
+    ), 25000, "Internship"),
+    _fallback_plan((
+        ("Professional Certification", 300, "certification", False, "one-time"),
+        ("Conference Attendance", 500, "networking", False, "one-time"),
+        ("Premium Tools", 300, "tools", True, "yearly"),
+    ), 65000, "Full-time"),
+    _fallback_plan((
+        ("Advanced Training", 800, "education", False, "one-time"),
+        ("Leadership Development", 400, "skill", False, "one-time"),
+    ), 85000, "Full-time"),
+    _fallback_plan((
+        ("Continued Education", 500, "education", False, "one-time"),
+        ("Industry Certifications", 400, "certification", False, "one-time"),
+    ), 110000, "Full-time"),
+)
 
 
 def _create_fallback_financial_analysis(career_path, profile, gap) -> FinancialAnalysis:
@@ -344,58 +537,13 @@ def _create_fallback_financial_analysis(career_path, profile, gap) -> FinancialA
         years_to_target_salary=3,
     )
     
-    # Create yearly financials
+    # Create yearly financials; years past the table repeat its last row
     cumulative_investment = 0
     cumulative_income = 0
+    last_plan = len(_FALLBACK_YEARLY_PLANS) - 1
     
     for year in range(1, total_years + 1):
-        if year == 1:
-            costs = [
-                ("Online Courses (Coursera, Udemy)", 500, "education", False, "one-time"),
-                ("Books and Learning Materials", 200, "education", False, "one-time"),
-                ("Cloud Platform Credits", 100, "tools", True, "yearly"),
-                ("Development Tools", 150, "tools", True, "yearly"),
-                ("Certification Prep Materials", 250, "certification", False, "one-time"),
-            ]
-            total_invest = sum(c[1] for c in costs)
-            income = 0
-            income_source = "None"
-        elif year == 2:
-            costs = [
-                ("Advanced Courses", 400, "education", False, "one-time"),
-                ("AWS Certification Exam", 150, "certification", False, "one-time"),
-                ("Professional Tools", 200, "tools", True, "yearly"),
-                ("Networking Events", 100, "networking", False, "one-time"),
-            ]
-            total_invest = sum(c[1] for c in costs)
-            income = 25000  # Internship
-            income_source = "Internship"
-        elif year == 3:
-            costs = [
-                ("Professional Certification", 300, "certification", False, "one-time"),
-                ("Conference Attendance", 500, "networking", False, "one-time"),
-                ("Premium Tools", 300, "tools", True, "yearly"),
-            ]
-            total_invest = sum(c[1] for c in costs)
-            income = 65000
-            income_source = "Full-time"
-        elif year == 4:
-            costs = [
-                ("Advanced Training", 800, "education", False, "one-time"),
-                ("Leadership Development", 400, "skill", False, "one-time"),
-            ]
-            total_invest = sum(c[1] for c in costs)
-            income = 85000
-            income_source = "Full-time"
-        else:
-            costs = [
-                ("Continued Education", 500, "education", False, "one-time"),
-                ("Industry Certifications", 400, "certification", False, "one-time"),
-            ]
-            total_invest = sum(c[1] for c in costs)
-            income = 110000
-            income_source = "Full-time"
-        
+        costs, total_invest, income, income_source = _FALLBACK_YEARLY_PLANS[min(year - 1, last_plan)]
         cumulative_investment += total_invest
         cumulative_income += income
         
@@ -407,17 +555,12 @@ def _create_fallback_financial_analysis(career_path, profile, gap) -> FinancialA
             net_cash_flow=income - total_invest,
             cumulative_investment=cumulative_investment,
             cumulative_income=cumulative_income,
+            cost_breakdown=[
+                CostBreakdown(item_name=item, amount=amount, category=cat, is_recurring=recurring, frequency=freq)
+                for item, amount, cat, recurring, freq in costs
+            ],
         )
         
-        for item, amount, cat, recurring, freq in costs:
-            yearly.cost_breakdown.append(CostBreakdown(
-                item_name=item,
-                amount=amount,
-                category=cat,
-                is_recurring=recurring,
-                frequency=freq,
-            ))
-        
         analysis.yearly_financials.append(yearly)
     
     analysis.total_investment_required = cumulative_investment
@@ -435,22 +578,23 @@ Year 3: Entry-level position
 Year 4: Growth and advancement
 Year 5: Senior role achievement"""
     
-    lines = [f"**{career_path.path_label}** ({career_path.total_years} years)"]
-    lines.append(f"Final Target: {career_path.final_target_role}")
-    lines.append(f"Expected Final Salary: ${career_path.final_expected_salary:,.0f}")
-    lines.append("")
-    
-    for year in career_path.yearly_plans:
-        lines.append(f"**{year.year_label}**")
-        lines.append(f"- Focus: {year.primary_focus}")
-        if year.expected_role:
-            lines.append(f"- Role: {year.expected_role}")
-        if year.expected_salary_range:
-            lines.append(f"- Salary: {year.expected_salary_range}")
-        if year.milestones:
-            lines.append("- Key Activities:")
-            for m in year.milestones[:2]:
-                lines.append(f"  * {m.title} (${m.estimated_cost}, {m.estimated_hours}h)")
-        lines.append("")
-    
-    return "\n".join(lines)
+    header = (
+        f"**{career_path.path_label}** ({career_path.total_years} years)\n"
+        f"Final Target: {career_path.final_target_role}\n"
+        f"Expected Final Salary: ${career_path.final_expected_salary:,.0f}\n"
+    )
+    return "\n".join([header, *map(_format_year_plan, career_path.yearly_plans)])
+
+
+def _format_year_plan(year) -> str:
+    """Format one yearly plan as a prompt block."""
+    block = f"**{year.year_label}**\n- Focus: {year.primary_focus}\n"
+    if year.expected_role:
+        block += f"- Role: {year.expected_role}\n"
+    if year.expected_salary_range:
+        block += f"- Salary: {year.expected_salary_range}\n"
+    if year.milestones:
+        block += "- Key Activities:\n" + "".join(
+            f"  * {m.title} (${m.estimated_cost}, {m.estimated_hours}h)\n" for m in year.milestones[:2]
+        )
+    return block
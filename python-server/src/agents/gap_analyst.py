@@ -4,10 +4,15 @@ The Diagnostic Engine - Compares user profile vs market requirements
 Uses structured output for reliable data extraction
 """
 
+import re
 import time
+from bisect import bisect_right
+from functools import lru_cache
 from typing import Optional
+import orjson
 from pydantic import BaseModel, Field
-from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.messages import SystemMessage
+from langchain_core.prompts import ChatPromptTemplate, HumanMessagePromptTemplate
 
 from ..models.state import CareerSimulationState, GapAnalysis, SkillGap
 from .base import get_llm
@@ -79,8 +84,7 @@ class GapAnalysisOutput(BaseModel):
     )
 
 
-GAP_ANALYSIS_PROMPT = ChatPromptTemplate.from_messages([
-    ("system", """You are an expert career gap analyst. Your task is to compare a candidate's current profile against market requirements and identify all gaps comprehensively.
+_SYSTEM_PROMPT = """You are an expert career gap analyst. Your task is to compare a candidate's current profile against market requirements and identify all gaps comprehensively.
 
 You MUST provide detailed analysis WITH REASONING for ALL categories:
 
@@ -123,16 +127,28 @@ IMPORTANT: For the ANALYSIS_REASONING field, provide a detailed explanation of w
 - Their work style and preferences alignment with the target role
 - Resume context if available
 
-Be thorough, specific, and constructive. NEVER leave arrays empty."""),
+Be thorough, specific, and constructive. NEVER leave arrays empty."""
+
+# Static instructions first, then role-level market context (shared by every
+# candidate targeting the same role), then the candidate's own details, so
+# provider prefix caching covers as much of the prompt as possible
+_HUMAN_PROMPT = """Perform a comprehensive gap analysis.
+
+Analyze thoroughly and provide a complete gap analysis with detailed reasoning for each assessment. Be specific with skill names, resources, priorities, and time estimates.
+
+**TARGET ROLES:** {target_roles}
+
+**MARKET REQUIREMENTS:**
+{market_requirements}
 
-    ("human", """Perform a comprehensive gap analysis:
+**MARKET CONDITIONS:**
+- Demand Level: {demand_level}
+- Competition Level: {competition_level}
+- Required Education: {required_education}
 
 **CANDIDATE PROFILE:**
 {profile_summary}
 
-**Resume Context (if available):**
-{resume_context}
-
 **Academic Details:**
 - Academic Strength Score: {academic_score}/100
 - Normalized GPA: {gpa}/100
@@ -149,18 +165,33 @@ Be thorough, specific, and constructive. NEVER leave arrays empty."""),
 - Role Preference: {role_preference}
 - Risk Tolerance: {risk_tolerance}
 
-**TARGET ROLES:** {target_roles}
+**Resume Context (if available):**
+{resume_context}"""
 
-**MARKET REQUIREMENTS:**
-{market_requirements}
+GAP_ANALYSIS_PROMPT = ChatPromptTemplate.from_messages([
+    SystemMessage(content=_SYSTEM_PROMPT),
+    HumanMessagePromptTemplate.from_template(_HUMAN_PROMPT),
+])
 
-**MARKET CONDITIONS:**
-- Demand Level: {demand_level}
-- Competition Level: {competition_level}
-- Required Education: {required_education}
 
-Analyze thoroughly and provide a complete gap analysis with detailed reasoning for each assessment. Be specific with skill names, resources, priorities, and time estimates.""")
-])
+GAP_ANALYST_TEMPERATURE = 0.3
+
+
+@lru_cache(maxsize=8)
+def _get_chain(temperature: float):
+    """Build the prompt -> structured-output chain once per temperature."""
+    structured_llm = get_llm(temperature=temperature).with_structured_output(GapAnalysisOutput)
+    return GAP_ANALYSIS_PROMPT | structured_llm
+
+
+def warm_gap_analyst() -> None:
+    """
+    Build the GapAnalyst chain ahead of the first simulation.
+    
+    The nested GapAnalysisOutput schema is converted to a tool schema when
+    the chain is built, so this keeps it off the first /simulate call.
+    """
+    _get_chain(GAP_ANALYST_TEMPERATURE)
 
 
 def gap_analyst_node(state: CareerSimulationState) -> dict:
@@ -169,56 +200,18 @@ def gap_analyst_node(state: CareerSimulationState) -> dict:
     Compares user profile against market requirements to identify gaps.
     Uses structured output for reliable data extraction.
     """
-    start_time = time.time()
+    start_ns = time.perf_counter_ns()
     
     normalized = state.get("normalized_profile")
     market = state.get("market_insights")
     profile = state["career_profile"]
     
-    # Format market requirements
-    market_requirements = _format_market_requirements(market)
     target_roles = ", ".join(profile.specific_roles) if profile.specific_roles else "Software Engineer"
     
-    # Get primary role demand/competition
-    demand_level = "Medium"
-    competition_level = "Medium"
-    required_education = "Bachelor's"
-    
-    if market and market.target_roles:
-        primary_role = market.target_roles[0]
-        demand_level = primary_role.demand_level
-        competition_level = primary_role.competition_level
-        required_education = primary_role.min_education or "Bachelor's"
-    
-    # Get resume context if available
-    resume_context = profile.resume_text if hasattr(profile, 'resume_text') and profile.resume_text else "No resume provided"
-    
-    # Get LLM with structured output
-    llm = get_llm(temperature=0.3)
+    inputs = _build_prompt_inputs(profile, normalized, market, target_roles)
     
     try:
-        structured_llm = llm.with_structured_output(GapAnalysisOutput)
-        chain = GAP_ANALYSIS_PROMPT | structured_llm
-        
-        analysis_output: GapAnalysisOutput = chain.invoke({
-            "profile_summary": normalized.profile_summary if normalized else "Profile not available",
-            "resume_context": resume_context,
-            "academic_score": round(normalized.academic_strength_score, 1) if normalized else 50,
-            "gpa": round(normalized.normalized_gpa, 1) if normalized else 50,
-            "tech_skills": str(normalized.combined_technical_skills) if normalized else "Not assessed",
-            "soft_skills": str(profile.soft_skills) if profile.soft_skills else "Not assessed",
-            "institution": profile.institution_name or "Not specified",
-            "years_to_grad": normalized.years_to_graduation if normalized else "Unknown",
-            "work_preference": profile.work_preference or "Not specified",
-            "work_style": profile.work_style or "Not specified",
-            "role_preference": profile.role_preference or "Not specified",
-            "risk_tolerance": profile.risk_tolerance or "Medium",
-            "target_roles": target_roles,
-            "market_requirements": market_requirements,
-            "demand_level": demand_level,
-            "competition_level": competition_level,
-            "required_education": required_education,
-        })
+        analysis_output: GapAnalysisOutput = _get_chain(GAP_ANALYST_TEMPERATURE).invoke(inputs)
         
         # Convert to GapAnalysis model
         gap_analysis = _convert_to_gap_analysis(analysis_output)
@@ -228,7 +221,74 @@ def gap_analyst_node(state: CareerSimulationState) -> dict:
         print(f"Structured output failed, using fallback: {e}")
         gap_analysis = _create_fallback_gap_analysis(profile, normalized, market, target_roles)
     
-    # Add vibe check for psychometric mismatches
+    return _gap_update(gap_analysis, profile, market, start_ns)
+
+
+async def gap_analyst_node_async(state: CareerSimulationState) -> dict:
+    """Async variant of gap_analyst_node using chain.ainvoke."""
+    start_ns = time.perf_counter_ns()
+    
+    normalized = state.get("normalized_profile")
+    market = state.get("market_insights")
+    profile = state["career_profile"]
+    
+    target_roles = ", ".join(profile.specific_roles) if profile.specific_roles else "Software Engineer"
+    
+    inputs = _build_prompt_inputs(profile, normalized, market, target_roles)
+    
+    try:
+        analysis_output: GapAnalysisOutput = await _get_chain(GAP_ANALYST_TEMPERATURE).ainvoke(inputs)
+        gap_analysis = _convert_to_gap_analysis(analysis_output)
+    except Exception as e:
+        print(f"Structured output failed, using fallback: {e}")
+        gap_analysis = _create_fallback_gap_analysis(profile, normalized, market, target_roles)
+    
+    return _gap_update(gap_analysis, profile, market, start_ns)
+
+
+def _json(obj: Optional[dict], empty: str = "Not assessed") -> str:
+    """Compact JSON for a skill-level dict, or a placeholder when it is empty."""
+    return orjson.dumps(obj).decode() if obj else empty
+
+
+def _build_prompt_inputs(profile, normalized, market, target_roles: str) -> dict:
+    """Collect the GAP_ANALYSIS_PROMPT variables."""
+    # Get primary role demand/competition
+    demand_level = "Medium"
+    competition_level = "Medium"
+    required_education = "Bachelor's"
+    
+    if market and market.target_roles:
+        primary_role = market.target_roles[0]
+        demand_level = primary_role.demand_level
+        competition_level = primary_role.competition_level
+        required_education = primary_role.min_education or "Bachelor's"
+    
+    return {
+        "profile_summary": normalized.profile_summary if normalized else "Profile not available",
+        # Get resume context if available
+        "resume_context": profile.resume_text or "No resume provided",
+        "academic_score": round(normalized.academic_strength_score, 1) if normalized else 50,
+        "gpa": round(normalized.normalized_gpa, 1) if normalized else 50,
+        "tech_skills": _json(normalized.combined_technical_skills if normalized else None),
+        "soft_skills": _json(profile.soft_skills),
+        "institution": profile.institution_name or "Not specified",
+        "years_to_grad": normalized.years_to_graduation if normalized else "Unknown",
+        "work_preference": profile.work_preference or "Not specified",
+        "work_style": profile.work_style or "Not specified",
+        "role_preference": profile.role_preference or "Not specified",
+        "risk_tolerance": profile.risk_tolerance or "Medium",
+        "target_roles": target_roles,
+        "market_requirements": _format_market_requirements(market),
+        "demand_level": demand_level,
+        "competition_level": competition_level,
+        "required_education": required_education,
+    }
+
+
+def _gap_update(gap_analysis: GapAnalysis, profile, market, start_ns: int) -> dict:
+    """Apply the vibe check and build the state update shared by both nodes."""
+    # Add vibe check for psychometric mismatches (pure Python, microseconds)
     vibe_issues = _perform_vibe_check(profile, market)
     gap_analysis.personality_frictions.extend(vibe_issues["frictions"])
     gap_analysis.stress_risks.extend(vibe_issues["stress_risks"])
@@ -236,7 +296,7 @@ def gap_analyst_node(state: CareerSimulationState) -> dict:
     # Determine if we should suggest alternatives (gap > 80%)
     should_suggest_alternatives = gap_analysis.overall_gap_score > 80
     
-    processing_time = (time.time() - start_time) * 1000
+    processing_time = (time.perf_counter_ns() - start_ns) / 1_000_000
     
     return {
         "gap_analysis": gap_analysis,
@@ -246,12 +306,21 @@ def gap_analyst_node(state: CareerSimulationState) -> dict:
     }
 
 
+# Scores below each threshold fall in the matching category; 80+ is severe
+_GAP_CATEGORY_THRESHOLDS = (20, 50, 80)
+_GAP_CATEGORIES = ("minimal", "manageable", "significant", "severe")
+
+
 def _convert_to_gap_analysis(output: GapAnalysisOutput) -> GapAnalysis:
     """Convert structured LLM output to GapAnalysis model."""
-    gap_analysis = GapAnalysis(
+    return GapAnalysis(
         overall_gap_score=output.overall_gap_score,
-        gap_category=output.gap_category,
+        # Ensure gap category matches score
+        gap_category=_GAP_CATEGORIES[bisect_right(_GAP_CATEGORY_THRESHOLDS, output.overall_gap_score)],
         analysis_reasoning=output.analysis_reasoning,
+        # Convert skill gaps with reasoning
+        technical_skill_gaps=[_to_skill_gap(sg) for sg in output.technical_skill_gaps],
+        soft_skill_gaps=[_to_skill_gap(sg) for sg in output.soft_skill_gaps],
         education_gap=output.education_gap,
         education_gap_reasoning=output.education_gap_reasoning,
         certification_gaps=output.certification_gaps,
@@ -266,137 +335,113 @@ def _convert_to_gap_analysis(output: GapAnalysisOutput) -> GapAnalysis:
         top_priorities=output.top_priorities,
         quick_wins=output.quick_wins,
     )
-    
-    # Convert skill gaps with reasoning
-    for sg in output.technical_skill_gaps:
-        # Handle learning_path - ensure it's a list
-        learning_path = sg.learning_path
-        if isinstance(learning_path, str):
-            # Split string into list if it's a string
-            learning_path = [step.strip() for step in learning_path.split('\n') if step.strip()]
-            if len(learning_path) <= 1 and learning_path:
-                # Try splitting by numbered items like "1. Step one 2. Step two"
-                import re
-                learning_path = re.split(r'\d+\.\s*', learning_path[0])
-                learning_path = [step.strip() for step in learning_path if step.strip()]
-        
-        gap_analysis.technical_skill_gaps.append(SkillGap(
-            skill_name=sg.skill_name,
-            current_level=sg.current_level,
-            required_level=sg.required_level,
-            gap_severity=sg.gap_severity,
-            estimated_time_to_close=sg.estimated_time_to_close,
-            recommended_resources=sg.recommended_resources,
-            reasoning=sg.reasoning,
-            priority=sg.priority,
-            learning_path=learning_path if isinstance(learning_path, list) else [],
-        ))
-    
-    for sg in output.soft_skill_gaps:
-        # Handle learning_path - ensure it's a list
-        learning_path = sg.learning_path
-        if isinstance(learning_path, str):
-            learning_path = [step.strip() for step in learning_path.split('\n') if step.strip()]
-            if len(learning_path) <= 1 and learning_path:
-                import re
-                learning_path = re.split(r'\d+\.\s*', learning_path[0])
-                learning_path = [step.strip() for step in learning_path if step.strip()]
-        
-        gap_analysis.soft_skill_gaps.append(SkillGap(
-            skill_name=sg.skill_name,
-            current_level=sg.current_level,
-            required_level=sg.required_level,
-            gap_severity=sg.gap_severity,
-            estimated_time_to_close=sg.estimated_time_to_close,
-            recommended_resources=sg.recommended_resources,
-            reasoning=sg.reasoning,
-            priority=sg.priority,
-            learning_path=learning_path if isinstance(learning_path, list) else [],
-        ))
-    
-    # Ensure gap category matches score
-    score = gap_analysis.overall_gap_score
-    if score < 20:
-        gap_analysis.gap_category = "minimal"
-    elif score < 50:
-        gap_analysis.gap_category = "manageable"
-    elif score < 80:
-        gap_analysis.gap_category = "significant"
-    else:
-        gap_analysis.gap_category = "severe"
-    
-    return gap_analysis
 
 
-def _create_fallback_gap_analysis(profile, normalized, market, target_role: str) -> GapAnalysis:
-    """Create a fallback gap analysis when LLM fails."""
-    gap_analysis = GapAnalysis(
-        overall_gap_score=55.0,
-        gap_category="significant",
+def _to_skill_gap(sg: SkillGapOutput) -> SkillGap:
+    """Convert one structured skill gap to the state model."""
+    return SkillGap(
+        skill_name=sg.skill_name,
+        current_level=sg.current_level,
+        required_level=sg.required_level,
+        gap_severity=sg.gap_severity,
+        estimated_time_to_close=sg.estimated_time_to_close,
+        recommended_resources=sg.recommended_resources,
+        reasoning=sg.reasoning,
+        priority=sg.priority,
+        learning_path=_normalize_learning_path(sg.learning_path),
     )
-    
-    # Add default technical skill gaps based on target role
-    default_skills = [
-        ("Python", "Intermediate", "Advanced", 50, "3 months", ["Codecademy Python Course", "LeetCode Practice", "Real Python Tutorials"]),
-        ("Data Structures & Algorithms", "Basic", "Advanced", 65, "4 months", ["Coursera Data Structures", "HackerRank", "NeetCode 150"]),
-        ("System Design", "None", "Intermediate", 70, "6 months", ["System Design Primer", "Educative.io", "ByteByteGo"]),
-        ("Cloud Services (AWS/GCP)", "None", "Intermediate", 60, "3 months", ["AWS Certified Cloud Practitioner", "A Cloud Guru", "AWS Free Tier Labs"]),
-        ("Git & Version Control", "Basic", "Advanced", 40, "1 month", ["Git Documentation", "GitHub Learning Lab", "Atlassian Git Tutorial"]),
-        ("SQL & Databases", "Basic", "Intermediate", 45, "2 months", ["SQLZoo", "Mode Analytics SQL Tutorial", "PostgreSQL Exercises"]),
-    ]
-    
-    for skill_name, current, required, severity, time_est, resources in default_skills:
-        gap_analysis.technical_skill_gaps.append(SkillGap(
-            skill_name=skill_name,
-            current_level=current,
-            required_level=required,
-            gap_severity=severity,
-            estimated_time_to_close=time_est,
-            recommended_resources=resources,
-        ))
-    
-    # Add default soft skill gaps
-    soft_skills = [
-        ("Technical Communication", "Intermediate", "Advanced", 45, "Ongoing", ["Toastmasters", "Technical Writing Course", "Documentation Practice"]),
-        ("Problem Solving", "Intermediate", "Expert", 55, "6 months", ["Critical Thinking Course", "Case Study Practice", "Mock Interviews"]),
-        ("Team Collaboration", "Basic", "Advanced", 50, "3 months", ["Agile/Scrum Certification", "Open Source Contributions", "Pair Programming"]),
-    ]
-    
-    for skill_name, current, required, severity, time_est, resources in soft_skills:
-        gap_analysis.soft_skill_gaps.append(SkillGap(
+
+
+# Numbered steps run together on one line, e.g. "1. Step one 2. Step two"
+_NUMBERED_ITEM_RE = re.compile(r'\d+\.\s*')
+
+
+def _normalize_learning_path(learning_path) -> list[str]:
+    """Ensure a skill gap's learning path is a list of steps."""
+    if isinstance(learning_path, str):
+        # Split string into list if it's a string
+        steps = [step.strip() for step in learning_path.split('\n') if step.strip()]
+        if len(steps) == 1:
+            steps = [step.strip() for step in _NUMBERED_ITEM_RE.split(steps[0]) if step.strip()]
+        return steps
+    return learning_path if isinstance(learning_path, list) else []
+
+
+# Fallback skill gaps: (skill_name, current, required, severity, time_to_close, resources)
+_FALLBACK_TECHNICAL_GAPS = (
+    ("Python", "Intermediate", "Advanced", 50, "3 months", ("Codecademy Python Course", "LeetCode Practice", "Real Python Tutorials")),
+    ("Data Structures & Algorithms", "Basic", "Advanced", 65, "4 months", ("Coursera Data Structures", "HackerRank", "NeetCode 150")),
+    ("System Design", "None", "Intermediate", 70, "6 months", ("System Design Primer", "Educative.io", "ByteByteGo")),
+    ("Cloud Services (AWS/GCP)", "None", "Intermediate", 60, "3 months", ("AWS Certified Cloud Practitioner", "A Cloud Guru", "AWS Free Tier Labs")),
+    ("Git & Version Control", "Basic", "Advanced", 40, "1 month", ("Git Documentation", "GitHub Learning Lab", "Atlassian Git Tutorial")),
+    ("SQL & Databases", "Basic", "Intermediate", 45, "2 months", ("SQLZoo", "Mode Analytics SQL Tutorial", "PostgreSQL Exercises")),
+)
+
+_FALLBACK_SOFT_GAPS = (
+    ("Technical Communication", "Intermediate", "Advanced", 45, "Ongoing", ("Toastmasters", "Technical Writing Course", "Documentation Practice")),
+    ("Problem Solving", "Intermediate", "Expert", 55, "6 months", ("Critical Thinking Course", "Case Study Practice", "Mock Interviews")),
+    ("Team Collaboration", "Basic", "Advanced", 50, "3 months", ("Agile/Scrum Certification", "Open Source Contributions", "Pair Programming")),
+)
+
+_FALLBACK_CERTIFICATION_GAPS = ("AWS Cloud Practitioner", "Professional Scrum Master I")
+
+_FALLBACK_CRITICAL_BOTTLENECKS = (
+    "Limited hands-on project experience in production environments",
+    "No industry internship experience",
+    "Gap in system design and architecture knowledge",
+)
+
+_FALLBACK_TIMELINE_BOTTLENECKS = (
+    "Learning curve for advanced technologies requires dedicated time",
+    "Building professional network in the industry takes 6-12 months",
+    "Portfolio projects need time to demonstrate competency",
+)
+
+_FALLBACK_EXISTING_STRENGTHS = (
+    "Strong educational foundation in computer science fundamentals",
+    "Clear career goals and high motivation",
+    "Good foundational programming knowledge",
+    "Academic projects provide starting portfolio",
+)
+
+_FALLBACK_COMPETITIVE_ADVANTAGES = (
+    "Fresh perspective and adaptability to new technologies",
+    "Current academic knowledge of latest industry trends",
+    "Lower salary expectations make you attractive for entry-level roles",
+)
+
+
+def _fallback_skill_gaps(rows: tuple) -> list[SkillGap]:
+    """Build fresh SkillGap models from a fallback table."""
+    return [
+        SkillGap(
             skill_name=skill_name,
             current_level=current,
             required_level=required,
             gap_severity=severity,
             estimated_time_to_close=time_est,
             recommended_resources=resources,
-        ))
-    
-    gap_analysis.certification_gaps = ["AWS Cloud Practitioner", "Professional Scrum Master I"]
-    gap_analysis.experience_gap_years = 1.5
-    gap_analysis.critical_bottlenecks = [
-        "Limited hands-on project experience in production environments",
-        "No industry internship experience",
-        "Gap in system design and architecture knowledge",
-    ]
-    gap_analysis.timeline_bottlenecks = [
-        "Learning curve for advanced technologies requires dedicated time",
-        "Building professional network in the industry takes 6-12 months",
-        "Portfolio projects need time to demonstrate competency",
+        )
+        for skill_name, current, required, severity, time_est, resources in rows
     ]
-    gap_analysis.existing_strengths = [
-        "Strong educational foundation in computer science fundamentals",
-        "Clear career goals and high motivation",
-        "Good foundational programming knowledge",
-        "Academic projects provide starting portfolio",
-    ]
-    gap_analysis.competitive_advantages = [
-        "Fresh perspective and adaptability to new technologies",
-        "Current academic knowledge of latest industry trends",
-        "Lower salary expectations make you attractive for entry-level roles",
-    ]
-    
-    return gap_analysis
+
+
+def _create_fallback_gap_analysis(profile, normalized, market, target_role: str) -> GapAnalysis:
+    """Create a fallback gap analysis when LLM fails."""
+    # Fresh models every call (validation copies the tuples into new lists):
+    # the vibe check extends these, so a shared prototype would leak between requests
+    return GapAnalysis(
+        overall_gap_score=55.0,
+        gap_category="significant",
+        technical_skill_gaps=_fallback_skill_gaps(_FALLBACK_TECHNICAL_GAPS),
+        soft_skill_gaps=_fallback_skill_gaps(_FALLBACK_SOFT_GAPS),
+        certification_gaps=_FALLBACK_CERTIFICATION_GAPS,
+        experience_gap_years=1.5,
+        critical_bottlenecks=_FALLBACK_CRITICAL_BOTTLENECKS,
+        timeline_bottlenecks=_FALLBACK_TIMELINE_BOTTLENECKS,
+        existing_strengths=_FALLBACK_EXISTING_STRENGTHS,
+        competitive_advantages=_FALLBACK_COMPETITIVE_ADVANTAGES,
+    )
 
 
 def _format_market_requirements(market) -> str:
@@ -411,27 +456,35 @@ def _format_market_requirements(market) -> str:
 - Problem-solving and analytical skills
 - Team collaboration experience"""
     
-    lines = []
-    for role in market.target_roles:
-        lines.append(f"\n### {role.role_title}")
-        
-        if role.hard_requirements:
-            lines.append("**Hard Requirements:**")
-            for req in role.hard_requirements:
-                lines.append(f"- {req.skill_or_qualification}: {req.description or 'Required'}")
-        
-        if role.soft_requirements:
-            lines.append("**Preferred:**")
-            for req in role.soft_requirements:
-                lines.append(f"- {req.skill_or_qualification}: {req.description or 'Preferred'}")
-        
-        if role.relevant_certifications:
-            lines.append(f"**Certifications:** {', '.join(role.relevant_certifications)}")
-        
-        if role.emerging_skills:
-            lines.append(f"**Emerging Skills:** {', '.join(role.emerging_skills)}")
+    return "\n".join(map(_format_role_requirements, market.target_roles))
+
+
+def _format_role_requirements(role) -> str:
+    """Format one target role's requirements as a prompt block."""
+    block = f"\n### {role.role_title}"
     
-    return "\n".join(lines) if lines else "Standard industry requirements apply"
+    if role.hard_requirements:
+        block += "\n**Hard Requirements:**" + "".join(
+            f"\n- {req.skill_or_qualification}: {req.description or 'Required'}" for req in role.hard_requirements
+        )
+    
+    if role.soft_requirements:
+        block += "\n**Preferred:**" + "".join(
+            f"\n- {req.skill_or_qualification}: {req.description or 'Preferred'}" for req in role.soft_requirements
+        )
+    
+    if role.relevant_certifications:
+        block += f"\n**Certifications:** {', '.join(role.relevant_certifications)}"
+    
+    if role.emerging_skills:
+        block += f"\n**Emerging Skills:** {', '.join(role.emerging_skills)}"
+    
+    return block
+
+
+# Role keywords checked by the vibe check (substring matches, like "engineering")
+_PRACTICAL_ROLE_RE = re.compile(r"engineer|developer|technician|craftsman|operator")
+_DYNAMIC_ROLE_RE = re.compile(r"consultant|entrepreneur|founder|freelance|creative")
 
 
 def _perform_vibe_check(profile, market) -> dict:
@@ -442,14 +495,15 @@ def _perform_vibe_check(profile, market) -> dict:
     frictions = []
     stress_risks = []
     
+    # All target roles lowered once, one per line, for the keyword searches below
+    target_roles = "\n".join(profile.specific_roles or []).lower()
+    
     # Theory vs Practical mismatch
     if profile.work_style:
         work_style_lower = profile.work_style.lower()
-        target_roles = [r.lower() for r in (profile.specific_roles or [])]
         
         if "theor" in work_style_lower:
-            practical_roles = ["engineer", "developer", "technician", "craftsman", "operator"]
-            if any(any(pr in role for pr in practical_roles) for role in target_roles):
+            if _PRACTICAL_ROLE_RE.search(target_roles):
                 frictions.append(
                     "Your theoretical work style may conflict with the hands-on nature of the target role. "
                     "Consider roles with more research/analysis components or plan to develop practical skills."
@@ -479,11 +533,9 @@ def _perform_vibe_check(profile, market) -> dict:
     # Structured vs Dynamic role preference
     if profile.role_preference:
         role_pref_lower = profile.role_preference.lower()
-        target_roles = [r.lower() for r in (profile.specific_roles or [])]
         
-        dynamic_roles = ["consultant", "entrepreneur", "founder", "freelance", "creative"]
         if "structured" in role_pref_lower:
-            if any(any(dr in role for dr in dynamic_roles) for role in target_roles):
+            if _DYNAMIC_ROLE_RE.search(target_roles):
                 frictions.append(
                     "You prefer structured roles but are targeting dynamic/fluid positions. "
                     "This may cause discomfort with ambiguity."
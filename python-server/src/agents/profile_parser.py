@@ -15,7 +15,6 @@ from .base import (
     normalize_gpa,
     infer_skills_from_major,
     calculate_age,
-    AgentConfig,
 )
 
 
@@ -207,7 +207,7 @@ def risk_assessor_node(state: CareerSimulationState) -> dict:
     expected_salary = career_path.final_expected_salary if career_path else 100000
     
     # Get resume context if available
-    resume_context = profile.resume_text if hasattr(profile, 'resume_text') and profile.resume_text else "No resume provided"
+    resume_context = profile.resume_text or "No resume provided"
     
     # Get LLM with structured output
     llm = get_llm(temperature=0.3)
@@ -5,11 +5,14 @@ Two-Stage Process:
 2. Stage 2 (Simulation): Selected Career → MarketScout → GapAnalyst → Timeline/Financial/Risk → Dashboard
 """
 
+import asyncio
 from typing import Literal
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph, START, END
 
 from .models.state import (
     CareerSimulationState,
+    MarketInsights,
     CareerMatcherResult,
     CareerFit,
     CareerFitReasoning,
@@ -19,9 +22,9 @@ from .models.career_profile import CareerProfile
 from .agents.profile_parser import profile_parser_node
 from .agents.career_matcher import career_matcher_node, CareerMatcherOutput
 from .agents.market_scout import market_scout_node
-from .agents.gap_analyst import gap_analyst_node
+from .agents.gap_analyst import gap_analyst_node, gap_analyst_node_async
 from .agents.timeline_simulator import timeline_simulator_node
-from .agents.financial_advisor import financial_advisor_node
+from .agents.financial_advisor import financial_advisor_node, financial_advisor_node_async
 from .agents.risk_assessor import risk_assessor_node
 from .agents.dashboard_formatter import dashboard_formatter_node
 
@@ -42,7 +45,7 @@ def build_career_matching_graph() -> StateGraph:
     
     # Add nodes
     workflow.add_node("profile_parser", profile_parser_node)
-    workflow.add_node("career_matcher", _career_matcher_wrapper)
+    workflow.add_node("career_matcher", career_matcher_step)
     
     # Add edges
     workflow.add_edge(START, "profile_parser")
@@ -56,8 +59,18 @@ def _career_matcher_wrapper(state: CareerSimulationState) -> dict:
     """Wrapper to convert CareerMatcherOutput to CareerMatcherResult."""
     from .agents.career_matcher import career_matcher_node
     
-    result = career_matcher_node(state)
+    return _to_matcher_result(career_matcher_node(state))
+
+
+async def _career_matcher_wrapper_async(state: CareerSimulationState) -> dict:
+    """Async wrapper; awaits the CareerMatcher LLM call instead of blocking a thread."""
+    from .agents.career_matcher import career_matcher_node_async
     
+    return _to_matcher_result(await career_matcher_node_async(state))
+
+
+def _to_matcher_result(result: dict) -> dict:
+    """Convert a CareerMatcher node update into CareerMatcherResult state."""
     # Convert the output to state-compatible format
     matcher_output = result.get("career_fits")
     if matcher_output and isinstance(matcher_output, CareerMatcherOutput):
@@ -111,8 +124,60 @@ def _career_matcher_wrapper(state: CareerSimulationState) -> dict:
     return result
 
 
+# invoke() runs the sync wrapper, ainvoke()/astream() the async one
+career_matcher_step = RunnableLambda(_career_matcher_wrapper, afunc=_career_matcher_wrapper_async)
+
+
 # ============ Stage 2: Full Simulation ============
 
+# GapAnalyst and FinancialAdvisor await their LLM calls natively under ainvoke()/astream()
+gap_analyst_step = RunnableLambda(gap_analyst_node, afunc=gap_analyst_node_async)
+financial_advisor_step = RunnableLambda(financial_advisor_node, afunc=financial_advisor_node_async)
+
+
+def _market_scout_wrapper(state: CareerSimulationState) -> dict:
+    """Reuse market insights prefetched after Stage 1, otherwise run MarketScout."""
+    if state.get("market_insights") is not None:
+        return {"current_node": "market_scout"}
+    return market_scout_node(state)
+
+
+async def prefetch_market_insights(
+    state: CareerSimulationState,
+    career_fits: list[CareerFit],
+) -> dict[str, MarketInsights]:
+    """
+    Speculatively run MarketScout for every Stage 1 career fit.
+    
+    Runs while the user is choosing a career so Stage 2 can skip the
+    market lookup for whichever fit is picked.
+    
+    Args:
+        state: State from Stage 1
+        career_fits: Candidate careers returned by CareerMatcher
+        
+    Returns:
+        Market insights keyed by career title (failed lookups are omitted)
+    """
+    async def scout(fit: CareerFit) -> MarketInsights:
+        profile = state["career_profile"].model_copy(update={
+            "specific_roles": [fit.career_title],
+            "target_career_fields": [fit.career_field],
+        })
+        update = await asyncio.to_thread(market_scout_node, {**state, "career_profile": profile})
+        return update["market_insights"]
+    
+    results = await asyncio.gather(*(scout(fit) for fit in career_fits), return_exceptions=True)
+    
+    prefetched = {}
+    for fit, insights in zip(career_fits, results):
+        if isinstance(insights, Exception):
+            print(f"⚠️ Market prefetch failed for {fit.career_title}: {insights}")
+            continue
+        prefetched[fit.career_title] = insights
+    return prefetched
+
+
 def should_suggest_alternatives(state: CareerSimulationState) -> Literal["suggest_alternatives", "simulate_timeline"]:
     """
     Conditional edge: Route based on gap severity.
@@ -268,11 +333,11 @@ def build_simulation_graph() -> StateGraph:
     workflow = StateGraph(CareerSimulationState)
     
     # Add all nodes
-    workflow.add_node("market_scout", market_scout_node)
-    workflow.add_node("gap_analyst", gap_analyst_node)
+    workflow.add_node("market_scout", _market_scout_wrapper)
+    workflow.add_node("gap_analyst", gap_analyst_step)
     workflow.add_node("alternative_suggester", alternative_path_suggester_node)
     workflow.add_node("timeline_simulator", timeline_simulator_node)
-    workflow.add_node("financial_advisor", financial_advisor_node)
+    workflow.add_node("financial_advisor", financial_advisor_step)
     workflow.add_node("risk_assessor", risk_assessor_node)
     workflow.add_node("dashboard_formatter", dashboard_formatter_node)
     
@@ -321,10 +386,10 @@ def build_career_simulator_graph() -> StateGraph:
     # Add all nodes
     workflow.add_node("profile_parser", profile_parser_node)
     workflow.add_node("market_scout", market_scout_node)
-    workflow.add_node("gap_analyst", gap_analyst_node)
+    workflow.add_node("gap_analyst", gap_analyst_step)
     workflow.add_node("alternative_suggester", alternative_path_suggester_node)
     workflow.add_node("timeline_simulator", timeline_simulator_node)
-    workflow.add_node("financial_advisor", financial_advisor_node)
+    workflow.add_node("financial_advisor", financial_advisor_step)
     workflow.add_node("risk_assessor", risk_assessor_node)
     workflow.add_node("dashboard_formatter", dashboard_formatter_node)
     
@@ -404,18 +469,12 @@ async def run_career_matching_async(profile_data: dict) -> CareerSimulationState
     return result
 
 
-def run_career_simulation_for_selected(state: CareerSimulationState, career_index: int) -> CareerSimulationState:
-    """
-    Stage 2: Run full simulation for selected career.
-    
-    Args:
-        state: State from Stage 1 with career_matcher_result
-        career_index: Index of selected career (0, 1, or 2)
-        
-    Returns:
-        Complete simulation state with all analysis
-    """
-    # Get the selected career
+def _prepare_selected_state(
+    state: CareerSimulationState,
+    career_index: int,
+    prefetched_market: dict[str, MarketInsights] | None = None,
+) -> CareerSimulationState:
+    """Validate the selection and point the Stage 1 state at the chosen career."""
     matcher_result = state.get("career_matcher_result")
     if not matcher_result or not matcher_result.career_fits:
         raise ValueError("No career fits available. Run Stage 1 first.")
@@ -425,15 +484,37 @@ def run_career_simulation_for_selected(state: CareerSimulationState, career_inde
     
     selected_career = matcher_result.career_fits[career_index]
     
-    # Update state with selection
+    # Work on copies: the in-process session store hands back the live session
+    # state, which must survive a failed run untouched for a retry
+    state = {**state}
     state["selected_career_index"] = career_index
     state["selected_career"] = selected_career
     state["stage"] = "simulation"
     
-    # Update profile with selected career as target
-    profile = state["career_profile"]
-    profile.specific_roles = [selected_career.career_title]
-    profile.target_career_fields = [selected_career.career_field]
+    state["career_profile"] = state["career_profile"].model_copy(update={
+        "specific_roles": [selected_career.career_title],
+        "target_career_fields": [selected_career.career_field],
+    })
+    
+    # Skip MarketScout only if insights were prefetched for this career;
+    # a miss resets them so MarketScout runs for the new selection
+    state["market_insights"] = (prefetched_market or {}).get(selected_career.career_title)
+    
+    return state
+
+
+def run_career_simulation_for_selected(state: CareerSimulationState, career_index: int) -> CareerSimulationState:
+    """
+    Stage 2: Run full simulation for selected career.
+    
+    Args:
+        state: State from Stage 1 with career_matcher_result
+        career_index: Index of selected career (0, 1, or 2)
+        
+    Returns:
+        Complete simulation state with all analysis
+    """
+    state = _prepare_selected_state(state, career_index)
     
     # Run Stage 2
     graph = compile_career_simulation()
@@ -444,25 +525,11 @@ def run_career_simulation_for_selected(state: CareerSimulationState, career_inde
 
 async def run_career_simulation_for_selected_async(
     state: CareerSimulationState, 
-    career_index: int
+    career_index: int,
+    prefetched_market: dict[str, MarketInsights] | None = None,
 ) -> CareerSimulationState:
     """Stage 2 async: Full simulation for selected career."""
-    matcher_result = state.get("career_matcher_result")
-    if not matcher_result or not matcher_result.career_fits:
-        raise ValueError("No career fits available. Run Stage 1 first.")
-    
-    if career_index < 0 or career_index >= len(matcher_result.career_fits):
-        raise ValueError(f"Invalid career index: {career_index}")
-    
-    selected_career = matcher_result.career_fits[career_index]
-    
-    state["selected_career_index"] = career_index
-    state["selected_career"] = selected_career
-    state["stage"] = "simulation"
-    
-    profile = state["career_profile"]
-    profile.specific_roles = [selected_career.career_title]
-    profile.target_career_fields = [selected_career.career_field]
+    state = _prepare_selected_state(state, career_index, prefetched_market)
     
     graph = compile_career_simulation()
     result = await graph.ainvoke(state)
@@ -470,6 +537,32 @@ async def run_career_simulation_for_selected_async(
     return result
 
 
+async def stream_career_simulation_for_selected(
+    state: CareerSimulationState,
+    career_index: int,
+    prefetched_market: dict[str, MarketInsights] | None = None,
+):
+    """
+    Stage 2 streaming: yield each agent's output as soon as it finishes.
+    
+    Yields:
+        (node_name, state_update) per completed node, then
+        ("complete", final_state) once the graph reaches END
+    """
+    state = _prepare_selected_state(state, career_index, prefetched_market)
+    
+    graph = compile_career_simulation()
+    final_state = state
+    async for mode, chunk in graph.astream(state, stream_mode=["updates", "values"]):
+        if mode == "values":
+            final_state = chunk
+            continue
+        for node_name, update in chunk.items():
+            yield node_name, update
+    
+    yield "complete", final_state
+
+
 # Legacy functions
 def run_career_simulation(profile_data: dict) -> CareerSimulationState:
     """Legacy: Run complete single-stage simulation."""
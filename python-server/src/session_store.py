@@ -0,0 +1,238 @@
+"""
+Session Store
+Persists Stage 1 results between /analyze and /simulate/selected
+"""
+
+import os
+import time
+import pickle
+import asyncio
+from collections import OrderedDict
+from typing import Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Redis connection
+REDIS_URL = os.getenv("REDIS_URL")
+SESSION_TTL_SECONDS = int(os.getenv("SESSION_TTL_SECONDS", 1800))
+SESSION_KEY_PREFIX = "sess:"
+MAX_LOCAL_SESSIONS = 10_000
+SWEEP_INTERVAL_SECONDS = 300
+
+# Stage 1 result cache (identical /analyze profiles)
+ANALYZE_CACHE_ENABLED = os.getenv("CACHE_ENABLED", "false").lower() == "true"
+ANALYZE_CACHE_TTL_SECONDS = int(os.getenv("ANALYZE_CACHE_TTL_SECONDS", 3600))
+ANALYZE_CACHE_PREFIX = "analyze:"
+MAX_LOCAL_ANALYSES = 1_000
+
+redis_client = None
+
+# In-process fallback used when REDIS_URL is not configured (single worker only).
+# Ordered by last access so the least recently used session is evicted first.
+_local_sessions: OrderedDict[str, dict] = OrderedDict()
+
+# Pickled Stage 1 states keyed by profile hash: (expires_at, payload)
+_local_analyses: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+
+
+async def connect_to_redis():
+    """
+    Initialize Redis connection.
+
+    Returns:
+        True when connected, False when REDIS_URL is not configured
+
+    Raises:
+        RuntimeError: If REDIS_URL is set but the server does not answer a ping
+    """
+    global redis_client
+    if not REDIS_URL:
+        print("⚠️ REDIS_URL not set, using in-process session store (single worker only)")
+        return False
+
+    try:
+        import redis.asyncio as redis
+
+        redis_client = redis.from_url(REDIS_URL)
+        # Verify connection
+        await redis_client.ping()
+        print("✅ Connected to Redis successfully!")
+        return True
+    except Exception as e:
+        print(f"❌ Failed to connect to Redis: {e}")
+        redis_client = None
+        # Falling back here would give every worker its own private session store
+        raise RuntimeError("REDIS_URL is set but Redis is unreachable") from e
+
+
+async def close_redis_connection():
+    """Close Redis connection"""
+    global redis_client
+    if redis_client is not None:
+        await redis_client.aclose()
+        redis_client = None
+        print("👋 Redis connection closed")
+
+
+async def save_session(session_id: str, session: dict) -> None:
+    """
+    Store a session with a TTL.
+
+    Args:
+        session_id: The session identifier returned to the client
+        session: Session payload (graph state, raw profile, timestamps)
+    """
+    if redis_client is None:
+        _local_sessions[session_id] = session
+        _local_sessions.move_to_end(session_id)
+        while len(_local_sessions) > MAX_LOCAL_SESSIONS:
+            _local_sessions.popitem(last=False)
+        return
+
+    # Graph state holds pydantic models, so pickle round-trips it losslessly
+    await redis_client.set(
+        f"{SESSION_KEY_PREFIX}{session_id}",
+        pickle.dumps(session, protocol=pickle.HIGHEST_PROTOCOL),
+        ex=SESSION_TTL_SECONDS,
+    )
+
+
+async def update_session(session_id: str, session: dict) -> bool:
+    """
+    Overwrite a session only if it still exists, keeping its remaining TTL.
+
+    Args:
+        session_id: The session identifier
+        session: Updated session payload
+
+    Returns:
+        True if the session was updated, False if it was already consumed or expired
+    """
+    if redis_client is None:
+        current = _local_sessions.get(session_id)
+        if current is None or current["created_at"] < time.time() - SESSION_TTL_SECONDS:
+            return False
+        _local_sessions[session_id] = session
+        return True
+
+    # XX never recreates a key Stage 2 has deleted; KEEPTTL leaves the expiry untouched
+    updated = await redis_client.set(
+        f"{SESSION_KEY_PREFIX}{session_id}",
+        pickle.dumps(session, protocol=pickle.HIGHEST_PROTOCOL),
+        xx=True,
+        keepttl=True,
+    )
+    return bool(updated)
+
+
+async def get_session(session_id: str) -> Optional[dict]:
+    """
+    Get a session by ID.
+
+    Args:
+        session_id: The session identifier
+
+    Returns:
+        The session payload or None if missing/expired
+    """
+    if redis_client is None:
+        session = _local_sessions.get(session_id)
+        if session is None:
+            return None
+        if session["created_at"] < time.time() - SESSION_TTL_SECONDS:
+            del _local_sessions[session_id]
+            return None
+        _local_sessions.move_to_end(session_id)
+        return session
+
+    raw = await redis_client.get(f"{SESSION_KEY_PREFIX}{session_id}")
+    if raw is None:
+        return None
+
+    return pickle.loads(raw)
+
+
+async def delete_session(session_id: str) -> None:
+    """
+    Delete a session once Stage 2 has consumed it.
+
+    Args:
+        session_id: The session identifier
+    """
+    if redis_client is None:
+        _local_sessions.pop(session_id, None)
+        return
+
+    await redis_client.delete(f"{SESSION_KEY_PREFIX}{session_id}")
+
+
+async def get_cached_analysis(cache_key: str) -> Optional[dict]:
+    """
+    Get a cached Stage 1 state for an identical profile.
+    
+    Args:
+        cache_key: Hash of the canonical profile JSON
+        
+    Returns:
+        A fresh copy of the cached state, or None on a miss
+    """
+    if redis_client is None:
+        entry = _local_analyses.get(cache_key)
+        if entry is None:
+            return None
+        expires_at, raw = entry
+        if expires_at < time.time():
+            del _local_analyses[cache_key]
+            return None
+        _local_analyses.move_to_end(cache_key)
+    else:
+        raw = await redis_client.get(f"{ANALYZE_CACHE_PREFIX}{cache_key}")
+        if raw is None:
+            return None
+    
+    # Stage 2 mutates the state in place, so every hit gets its own copy
+    return pickle.loads(raw)
+
+
+async def cache_analysis(cache_key: str, state: dict) -> None:
+    """
+    Cache a Stage 1 state for reuse by identical profiles.
+    
+    Args:
+        cache_key: Hash of the canonical profile JSON
+        state: Graph state returned by career matching
+    """
+    raw = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+    if redis_client is None:
+        _local_analyses[cache_key] = (time.time() + ANALYZE_CACHE_TTL_SECONDS, raw)
+        _local_analyses.move_to_end(cache_key)
+        while len(_local_analyses) > MAX_LOCAL_ANALYSES:
+            _local_analyses.popitem(last=False)
+        return
+    
+    await redis_client.set(f"{ANALYZE_CACHE_PREFIX}{cache_key}", raw, ex=ANALYZE_CACHE_TTL_SECONDS)
+
+
+def sweep_expired_sessions() -> int:
+    """
+    Drop in-process sessions older than the TTL.
+
+    Returns:
+        Number of sessions removed
+    """
+    cutoff = time.time() - SESSION_TTL_SECONDS
+    expired = [sid for sid, session in _local_sessions.items() if session["created_at"] < cutoff]
+    for sid in expired:
+        del _local_sessions[sid]
+    return len(expired)
+
+
+async def run_session_sweeper():
+    """Periodically evict abandoned in-process sessions (Redis expires keys itself)."""
+    while True:
+        await asyncio.sleep(SWEEP_INTERVAL_SECONDS)
+        if redis_client is None:
+            removed = sweep_expired_sessions()
+            if removed:
+                print(f"🧹 Swept {removed} expired session(s)")